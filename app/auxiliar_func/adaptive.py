@@ -0,0 +1,94 @@
+import numpy as np
+from app.auxiliar_func.parallel import solve_points, worker_pool
+
+
+def _sort_key(point):
+    return tuple(-np.inf if value is None else value for value in point)
+
+
+def refinement_candidates(solved, values, tol):
+    """
+    Returns {midpoint: error} for the intervals of the solved points whose estimated error exceeds tol.
+
+    Along every axis (T, P, n) the points sharing the other two coordinates form a line. For each
+    interior point of a line, the error is its distance to the linear interpolation of its two
+    neighbours (max over the values). This error is assigned to both adjacent intervals. It catches
+    both curvature and jumps such as the onset of a solid phase.
+    """
+    candidates = {}
+    for axis in range(3):
+        lines = {}
+        for point in solved:
+            if point[axis] is None:
+                continue
+            lines.setdefault(point[:axis] + point[axis + 1:], []).append(point)
+
+        for line in lines.values():
+            if len(line) < 3:
+                continue
+            line.sort(key=lambda p: p[axis])
+            coords = np.array([p[axis] for p in line], dtype=float)
+            data = np.array([values(solved[p]) for p in line], dtype=float)
+
+            weight = (coords[1:-1] - coords[:-2]) / (coords[2:] - coords[:-2])
+            interpolated = data[:-2] + weight[:, None] * (data[2:] - data[:-2])
+            error = np.nanmax(np.abs(data[1:-1] - interpolated), axis=1)
+
+            interval_error = np.zeros(len(line) - 1)
+            interval_error[:-1] = np.fmax(interval_error[:-1], error)
+            interval_error[1:] = np.fmax(interval_error[1:], error)
+
+            for k in np.flatnonzero(interval_error > tol):
+                midpoint = list(line[k])
+                midpoint[axis] = (coords[k] + coords[k + 1]) / 2
+                midpoint = tuple(midpoint)
+                candidates[midpoint] = max(candidates.get(midpoint, 0.0), interval_error[k])
+    return candidates
+
+
+def adaptive_sweep(runner, points, reference_index, values, tol, max_points, max_passes=8, progress=None, should_stop=None):
+    """
+    Solves the coarse grid, then repeatedly adds interval midpoints where refinement_candidates
+    finds an error above tol (largest errors first) until none is left, max_points is reached or
+    max_passes refinement passes were made. progress(solved, max_points) is called after every point
+    and should_stop() ends the refinement early, keeping the points solved so far.
+
+    Returns the solved points sorted by (T, P, n) and the array of their solve_point results.
+    The solver instance (one per worker in parallel runs) is created once and reused by every pass.
+    """
+    solved = {}
+    parallel = runner.workers is not None and runner.workers > 1
+    instance = None if parallel else runner.create_instance()
+    executor = worker_pool(runner, runner.workers) if parallel else None
+
+    def solve(new_points):
+        tasks = [(idx, point + (reference_index,)) for idx, point in enumerate(new_points)]
+        def store(result, idx):
+            solved[new_points[idx]] = result
+            if progress is not None:
+                progress(len(solved), max_points)
+
+        return solve_points(runner, tasks, runner.workers, callback=store, should_stop=should_stop,
+                            instance=instance, executor=executor)[1]
+
+    try:
+        total_iterations = solve(list(points))
+
+        for _ in range(max_passes):
+            if should_stop is not None and should_stop():
+                break
+            budget = max_points - len(solved)
+            if budget <= 0:
+                break
+            candidates = refinement_candidates(solved, values, tol)
+            new_points = [point for point in sorted(candidates, key=candidates.get, reverse=True) if point not in solved]
+            if not new_points:
+                break
+            total_iterations += solve(new_points[:budget])
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    runner.total_iterations = total_iterations
+    points = sorted(solved, key=_sort_key)
+    return points, np.array([solved[point] for point in points])
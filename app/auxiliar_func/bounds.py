@@ -0,0 +1,17 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def inhibited_index(data, inhibited_component):
+    """
+    Returns the position of the inhibited component in data (the component dicts keyed by name),
+    or None when no component is inhibited or it is not found. Shared by Gibbs and Entropy, whose
+    bounds keep this component at or below 1e-5 mol.
+    """
+    if inhibited_component and inhibited_component != '---':
+        try:
+            return next(i for i, value in enumerate(data.values()) if value['Component'] == inhibited_component)
+        except StopIteration:
+            logger.warning("Inhibited component '%s' not found.", inhibited_component)
+    return None
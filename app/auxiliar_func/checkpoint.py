@@ -0,0 +1,49 @@
+import logging
+import os
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Periodically saves the result buffer of a sweep and the mask of finished grid indices to an
+    .npz file, every `every` new points or `interval` seconds, whichever comes first. The file carries a
+    signature of the sweep (data, grid, options), so a resume only loads results of the same sweep.
+    """
+    def __init__(self, path, signature, every=100, interval=60.0):
+        self.path = path
+        self.signature = signature
+        self.every = every
+        self.interval = interval
+        self._pending = 0
+        self._last_save = time.monotonic()
+
+    def load(self, solved, done):
+        """
+        Fills solved and done in place from the checkpoint file. Returns the number of recovered points.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with np.load(self.path) as state:
+            if str(state['signature']) != self.signature or state['solved'].shape != solved.shape:
+                logger.warning("O checkpoint '%s' pertence a outra varredura e será ignorado.", self.path)
+                return 0
+            solved[:] = state['solved']
+            done[:] = state['done']
+        return int(done.sum())
+
+    def update(self, solved, done):
+        self._pending += 1
+        if self._pending >= self.every or time.monotonic() - self._last_save >= self.interval:
+            self.save(solved, done)
+
+    def save(self, solved, done):
+        # Written to a temporary file first, so a crash during the write keeps the previous checkpoint.
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, signature=np.array(self.signature), solved=solved, done=done)
+        os.replace(temporary, self.path)
+        self._pending = 0
+        self._last_save = time.monotonic()
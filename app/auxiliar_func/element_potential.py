@@ -0,0 +1,149 @@
+import numpy as np
+
+# ln(1e-4) bound used to keep trace species from being driven to zero in one step (as in NASA CEA).
+LN_TRACE = -9.2103404
+
+
+def rand_equilibrium(g, A, feeds, P, phases, excluded=None, tol=1e-10, max_iter=200):
+    """
+    Ideal-gas chemical equilibrium by the element-potential (RAND) Newton method, vectorized over
+    many feed vectors. Gases form an ideal mixture and solids are pure phases that may appear or vanish.
+    The objective is the one of Gibbs.gibbs_rule: the mole fractions in ln(n_j/n) are taken over
+    every component, solids included, so both engines return the same equilibrium.
+
+    Parameters:
+    g (array): mu0_i / (R*T) of every component, shape (ncomp,) or (N, ncomp).
+    A (array): Formula matrix, shape (ncomp, nelements).
+    feeds (array): Initial mols, shape (ncomp,) or (N, ncomp).
+    P (float or array): Pressure in bar, scalar or shape (N,).
+    phases (list): 'g' or 's' for every component.
+    excluded (array): Boolean mask of components kept out of the equilibrium (inhibited).
+
+    Returns:
+    tuple: (n, converged, iterations) with n of shape (N, ncomp) and converged of shape (N,).
+    """
+    feeds = np.atleast_2d(np.asarray(feeds, dtype=float))
+    N, ncomp = feeds.shape
+    g = np.broadcast_to(np.asarray(g, dtype=float), (N, ncomp))
+    lnP = np.log(np.broadcast_to(np.asarray(P, dtype=float), (N,)))
+    A = np.asarray(A, dtype=float)
+    excluded = np.zeros(ncomp, dtype=bool) if excluded is None else np.asarray(excluded, dtype=bool)
+
+    phases = np.asarray(phases)
+    gas = np.flatnonzero((phases != 's') & ~excluded)
+    solid = np.flatnonzero((phases == 's') & ~excluded)
+    elements = np.flatnonzero(np.any(A[np.concatenate([gas, solid])] != 0, axis=0))
+    ng, ns, m = len(gas), len(solid), len(elements)
+
+    Ag = A[np.ix_(gas, elements)]           # (ng, m)
+    As = A[np.ix_(solid, elements)]         # (ns, m)
+    b = feeds @ A[:, elements]              # (N, m)
+    gg = g[:, gas]
+    gs = g[:, solid]
+
+    # Start from an even split of the feed over the gases, with no solids.
+    n_total = np.maximum(feeds.sum(axis=1), 1e-8)
+    ln_nj = np.log(np.repeat((n_total / max(ng, 1))[:, None], ng, axis=1))
+    ln_n = np.log(n_total)
+    ns_mol = np.zeros((N, ns))
+    active = np.zeros((N, ns), dtype=bool)
+    # kappa = -(solid mols)/n: shift of the gas potentials caused by the solids in the mole fractions.
+    kappa = np.zeros(N)
+
+    converged = np.zeros(N, dtype=bool)
+    size = m + ns + 2
+    k, t = m + ns, m + ns + 1
+    iterations = 0
+
+    for iterations in range(1, max_iter + 1):
+        nj = np.exp(ln_nj)
+        n = np.exp(ln_n)
+        mu = gg + ln_nj - ln_n[:, None] + lnP[:, None]
+        solids = ns_mol.sum(axis=1)
+
+        M = np.zeros((N, size, size))
+        rhs = np.zeros((N, size))
+
+        # Element rows
+        M[:, :m, :m] = (Ag.T * nj[:, None, :]) @ Ag
+        M[:, :m, m:k] = np.where(active[:, None, :], As.T[None, :, :], 0.0)
+        bg = nj @ Ag
+        M[:, :m, k] = bg
+        M[:, :m, t] = bg
+        rhs[:, :m] = b - bg - ns_mol @ As + (nj * mu) @ Ag
+
+        # Solid rows: a_s . pi + kappa = mu0_s / RT - 1 for solids present, delta n_s = 0 otherwise.
+        M[:, m:k, :m] = np.where(active[:, :, None], As[None, :, :], 0.0)
+        M[:, m:k, k] = np.where(active, 1.0, 0.0)
+        M[:, m + np.arange(ns), m + np.arange(ns)] = np.where(active, 0.0, 1.0)
+        rhs[:, m:k] = np.where(active, gs - 1.0, 0.0)
+
+        # kappa row: kappa * n + solid mols = 0
+        M[:, k, m:k] = active
+        M[:, k, k] = n
+        M[:, k, t] = kappa * n
+        rhs[:, k] = -solids
+
+        # Total row: gas mols + solid mols = n
+        M[:, t, :m] = bg
+        M[:, t, m:k] = active
+        M[:, t, k] = nj.sum(axis=1)
+        M[:, t, t] = nj.sum(axis=1) - n
+        rhs[:, t] = n - nj.sum(axis=1) - solids + (nj * mu).sum(axis=1)
+
+        # Converged rows keep iterating with (near) zero steps, which avoids re-indexing every array.
+        try:
+            x = np.linalg.solve(M, rhs[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            break
+
+        pi = x[:, :m]
+        d_ns = x[:, m:k]
+        d_kappa = x[:, k] - kappa
+        d_ln_n = x[:, t]
+        d_ln_nj = pi @ Ag.T + x[:, k, None] - mu + d_ln_n[:, None]
+
+        # Step control (Gordon & McBride): limit large changes and keep trace species finite.
+        frac = ln_nj - ln_n[:, None]
+        major = frac > np.log(1e-8)
+        big = np.maximum(np.abs(d_ln_n), np.max(np.where(major & (d_ln_nj > 0), np.abs(d_ln_nj), 0.0), axis=1, initial=0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam1 = 2.0 / big
+            lam2_j = np.abs((-frac - LN_TRACE) / (d_ln_nj - d_ln_n[:, None]))
+        lam2 = np.min(np.where(~major & (d_ln_nj >= 0), lam2_j, np.inf), axis=1, initial=np.inf)
+        lam = np.fmin(1.0, np.fmin(lam1, lam2))[:, None]
+
+        ln_nj += lam * d_ln_nj
+        ln_n += lam[:, 0] * d_ln_n
+        ns_mol += lam * d_ns
+        kappa += lam[:, 0] * d_kappa
+
+        # Solids driven below zero leave the system.
+        active &= ns_mol > 0
+        ns_mol[~active] = 0.0
+
+        step = np.max(np.abs(lam * d_ln_nj) * np.exp(ln_nj - ln_n[:, None]), axis=1, initial=0.0)
+        step = np.fmax(step, np.abs(lam[:, 0] * d_ln_n))
+        step = np.fmax(step, np.abs(lam[:, 0] * d_kappa))
+        step = np.fmax(step, np.max(np.abs(lam * d_ns), axis=1, initial=0.0) / n_total)
+        converged = step < tol
+
+        # Converged rows: solids whose chemical potential lies below the element-potential plane enter.
+        if ns and converged.any():
+            enter = converged[:, None] & ~active & (gs - 1.0 - kappa[:, None] - pi @ As.T < -1e-8)
+            if enter.any():
+                active |= enter
+                ns_mol[enter] = (1e-6 * n_total[:, None] * np.ones(ns))[enter]
+                converged &= ~enter.any(axis=1)
+
+        if converged.all():
+            break
+
+    return _result(feeds, gas, solid, ln_nj, ns_mol), converged, iterations
+
+
+def _result(feeds, gas, solid, ln_nj, ns_mol):
+    n = np.zeros_like(feeds)
+    n[:, gas] = np.exp(ln_nj)
+    n[:, solid] = ns_mol
+    return n
@@ -1,6 +1,109 @@
+import logging
 import numpy as np
 import pandas as pd
-import pyomo.environ as pyo
+from app.auxiliar_func.property_cache import property_cache, data_key
+
+logger = logging.getLogger(__name__)
+
+R = 8.314462    # Constante universal dos gases em J/(mol*K) ou Pa*m^3/(mol*K)
+
+EOS_PARAMS = {
+    'Peng-Robinson': {
+        'Omega_a': 0.45724, 'Omega_b': 0.07780,
+        'm_func': lambda w: 0.37464 + 1.54226 * w - 0.26992 * w**2,
+        'alpha_func': lambda Tr_scalar, m_scalar: (1 + m_scalar * (1 - np.sqrt(Tr_scalar)))**2,
+        'Z_coeffs': lambda A, B: [1, B - 1, A - 2*B - 3*B**2, -A*B + B**2 + B**3],
+        'ln_phi_term': lambda Z, B, log=np.log: (1 / (2 * np.sqrt(2))) * log((Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B))
+    },
+    'Soave-Redlich-Kwong': {
+        'Omega_a': 0.42748, 'Omega_b': 0.08664,
+        'm_func': lambda w: 0.480 + 1.574 * w - 0.176 * w**2,
+        'alpha_func': lambda Tr_scalar, m_scalar: (1 + m_scalar * (1 - np.sqrt(Tr_scalar)))**2,
+        'Z_coeffs': lambda A, B: [1, -1, A - B - B**2, -A*B],
+        'ln_phi_term': lambda Z, B, log=np.log: log(1 + B/Z)
+    },
+    'Redlich-Kwong': {
+        'Omega_a': 0.42748, 'Omega_b': 0.08664,
+        'm_func': lambda w: np.zeros_like(w), 
+        'alpha_func': lambda Tr_scalar, m_scalar: 1 / np.sqrt(Tr_scalar),
+        'Z_coeffs': lambda A, B: [1, -1, A - B - B**2, -A*B],
+        'ln_phi_term': lambda Z, B, log=np.log: log(1 + B/Z)
+    }
+}
+
+
+def cubic_parameters(T, eq, gas_components):
+    """
+    Returns the attraction (a_i, at temperature T) and covolume (b_i) parameters of a cubic EoS
+    for the gas components, in SI units. For a scalar T, a_i is kept in the shared property cache;
+    for an array of temperatures a_i has shape (nT, ncomp).
+    """
+    params = EOS_PARAMS[eq]
+    gas_comp_names = list(gas_components.keys())
+
+    Tc = np.array([gas_components[name]['Tc'] for name in gas_comp_names])
+    Pc = np.array([gas_components[name]['Pc'] * 1e5 for name in gas_comp_names]) # Usa Pa
+    omega = np.array([gas_components[name]['omega'] for name in gas_comp_names])
+
+    def attraction(T):
+        m = params['m_func'](omega)
+        Tr = np.asarray(T, dtype=float)[..., None] / Tc
+        alpha = params['alpha_func'](Tr, m)
+        return params['Omega_a'] * (R**2 * Tc**2 / Pc) * alpha
+
+    if np.ndim(T) == 0:
+        a_i = property_cache.get(f'{eq} a_i', T, data_key(gas_components), lambda: attraction(T))
+    else:
+        a_i = attraction(T)
+    b_i = params['Omega_b'] * (R * Tc / Pc)
+    return a_i, b_i
+
+
+def virial_mixing_rules(gas_components, df_kij):
+    """
+    Returns the temperature-independent cross parameters of the virial correlation for every
+    component pair: (Tc_ij, omega_ij, R*Tc_ij/Pc_ij). Computed once per component set and kij matrix.
+    """
+    gas_comp_names = list(gas_components.keys())
+
+    def mixing_rules():
+        Tc = np.array([gas_components[name]['Tc'] for name in gas_comp_names], dtype=float)
+        omega = np.array([gas_components[name]['omega'] for name in gas_comp_names], dtype=float)
+        Zc = np.array([gas_components[name]['Zc'] for name in gas_comp_names], dtype=float)
+        Vc_cm3_mol = np.array([gas_components[name]['Vc'] for name in gas_comp_names], dtype=float)
+
+        # Converte Vc para m^3/mol
+        Vc = Vc_cm3_mol / 1e6
+
+        kij = df_kij.values
+        Tcij = np.sqrt(np.outer(Tc, Tc)) * (1 - kij)
+        wij = (omega[:, None] + omega[None, :]) / 2
+        Vcij = ((np.cbrt(Vc)[:, None] + np.cbrt(Vc)[None, :]) / 2)**3
+        Zcij = (Zc[:, None] + Zc[None, :]) / 2
+        Pcij_pa = Zcij * R * Tcij / Vcij
+        return np.stack([Tcij, wij, R * Tcij / Pcij_pa])
+
+    return property_cache.get('virial mixing rules', None, data_key(gas_components, df_kij), mixing_rules)
+
+
+def virial_matrix(T, gas_components, df_kij):
+    """
+    Returns the matrix of second virial coefficients B_ij(T) (m^3/mol) of the gas components.
+    For a scalar T the matrix is kept in the shared property cache; for an array of temperatures
+    the result has shape (nT, ncomp, ncomp).
+    """
+    Tcij, wij, scale = virial_mixing_rules(gas_components, df_kij)
+
+    def virial_B(T):
+        Tr_ij = np.asarray(T, dtype=float)[..., None, None] / Tcij
+        B0 = 0.083 - 0.422 / (Tr_ij**1.6)
+        B1 = 0.139 - 0.172 / (Tr_ij**4.2)
+        return scale * (B0 + wij * B1)
+
+    if np.ndim(T) == 0:
+        return property_cache.get('virial_B', T, data_key(gas_components, df_kij), lambda: virial_B(T))
+    return virial_B(T)
+
 
 def fug(T,                          # Temperature K
         P,                          # Pressure bar
@@ -8,8 +111,7 @@ def fug(T,                          # Temperature K
         n,                          # Molar fraction of components
         components,                 # Thermodynamic data about components
         kij_df: pd.DataFrame):      # Dataframe with kij parameters
-    
-    R = 8.314462    # Constante universal dos gases em J/(mol*K) ou Pa*m^3/(mol*K)
+
     P_pa = P * 1e5  # Converte pressão de bar para Pa
 
     comp_names = list(components.keys())
@@ -21,7 +123,7 @@ def fug(T,                          # Temperature K
     if not comp_names:
         return []
 
-    mole_fractions = {name: n_i / total_n for name, n_i in zip(comp_names, n)}
+    mols = dict(zip(comp_names, n))
     resultados_lista = [0.0] * len(comp_names)
 
     gas_components = {name: data for name, data in components.items() if data.get('Phase', 'g').lower() != 's'}
@@ -41,42 +143,23 @@ def fug(T,                          # Temperature K
         return resultados_lista
 
     gas_comp_names = list(gas_components.keys())
-    y = np.array([mole_fractions[name] for name in gas_comp_names])
+    # Frações molares da fase gás (os sólidos são fases puras)
+    y = np.array([mols[name] for name in gas_comp_names], dtype=float)
+    y = y / y.sum()
     
     df_kij = kij_df.reindex(index=gas_comp_names, columns=gas_comp_names, fill_value=0)
 
-    if np.any(df_kij.values != 0):
-        print(f"INFO (fug): Parâmetros de interação binária (kij) não-nulos foram encontrados e serão considerados nos cálculos da EoS '{eq}'.")
-    else:
-        print(f"INFO (fug): A matriz Kij consiste apenas em zeros. Os cálculos da EoS '{eq}' prosseguirão assumindo interações ideais (kij = 0).")
+    # Chamado a cada ponto: a mensagem só é montada com o nível DEBUG ativo
+    if logger.isEnabledFor(logging.DEBUG):
+        if np.any(df_kij.values != 0):
+            logger.debug("fug: Parâmetros de interação binária (kij) não-nulos foram encontrados e serão considerados nos cálculos da EoS '%s'.", eq)
+        else:
+            logger.debug("fug: A matriz Kij consiste apenas em zeros. Os cálculos da EoS '%s' prosseguirão assumindo interações ideais (kij = 0).", eq)
 
     # Equação Virial (Truncada no 2º Coeficiente)
     if eq == 'Virial':
-        Tc = np.array([gas_components[name]['Tc'] for name in gas_comp_names])
-        omega = np.array([gas_components[name]['omega'] for name in gas_comp_names])
-        Zc = np.array([gas_components[name]['Zc'] for name in gas_comp_names])
-        Vc_cm3_mol = np.array([gas_components[name]['Vc'] for name in gas_comp_names])
-        
-        # Converte Vc para m^3/mol
-        Vc = Vc_cm3_mol / 1e6
+        B_matrix = virial_matrix(T, gas_components, df_kij)
 
-        kij = df_kij.values
-        num_comps = len(gas_comp_names)
-        B_matrix = np.zeros((num_comps, num_comps))
-
-        for i in range(num_comps):
-            for j in range(num_comps):
-                Tcij = np.sqrt(Tc[i] * Tc[j]) * (1 - kij[i, j])
-                wij = (omega[i] + omega[j]) / 2
-                Vcij = ((Vc[i]**(1/3) + Vc[j]**(1/3)) / 2)**3
-                Zcij = (Zc[i] + Zc[j]) / 2
-                Pcij_pa = Zcij * R * Tcij / Vcij
-                
-                Tr_ij = T / Tcij
-                B0 = 0.083 - 0.422 / (Tr_ij**1.6)
-                B1 = 0.139 - 0.172 / (Tr_ij**4.2)
-                B_matrix[i, j] = (R * Tcij / Pcij_pa) * (B0 + wij * B1)
-        
         B_mix = y.T @ B_matrix @ y
         sum_yB = B_matrix @ y
         ln_phi_k = (2 * sum_yB - B_mix) * P_pa / (R * T)
@@ -89,49 +172,13 @@ def fug(T,                          # Temperature K
             
         return resultados_lista
 
-    eos_params = {
-        'Peng-Robinson': {
-            'Omega_a': 0.45724, 'Omega_b': 0.07780,
-            'm_func': lambda w: 0.37464 + 1.54226 * w - 0.26992 * w**2,
-            'alpha_func': lambda Tr_scalar, m_scalar: (1 + m_scalar * (1 - pyo.sqrt(Tr_scalar)))**2,
-            'Z_coeffs': lambda A, B: [1, B - 1, A - 2*B - 3*B**2, -A*B + B**2 + B**3],
-            'ln_phi_term': lambda Z, B: (1 / (2 * np.sqrt(2))) * np.log((Z + (1 + np.sqrt(2)) * B) / (Z + (1 - np.sqrt(2)) * B))
-        },
-        'Soave-Redlich-Kwong': {
-            'Omega_a': 0.42748, 'Omega_b': 0.08664,
-            'm_func': lambda w: 0.480 + 1.574 * w - 0.176 * w**2,
-            'alpha_func': lambda Tr_scalar, m_scalar: (1 + m_scalar * (1 - pyo.sqrt(Tr_scalar)))**2,
-            'Z_coeffs': lambda A, B: [1, -1, A - B - B**2, -A*B],
-            'ln_phi_term': lambda Z, B: np.log(1 + B/Z)
-        },
-        'Redlich-Kwong': {
-            'Omega_a': 0.42748, 'Omega_b': 0.08664,
-            'm_func': lambda w: np.zeros_like(w), 
-            'alpha_func': lambda Tr_scalar, m_scalar: 1 / pyo.sqrt(Tr_scalar),
-            'Z_coeffs': lambda A, B: [1, -1, A - B - B**2, -A*B],
-            'ln_phi_term': lambda Z, B: np.log(1 + B/Z)
-        }
-    }
-    
-    if eq not in eos_params:
+    if eq not in EOS_PARAMS:
         raise ValueError(f"Equação de estado '{eq}' não suportada.")
     
-    params = eos_params[eq]
+    params = EOS_PARAMS[eq]
     
-    Tc = np.array([gas_components[name]['Tc'] for name in gas_comp_names])
-    Pc = np.array([gas_components[name]['Pc'] * 1e5 for name in gas_comp_names]) # Usa Pa
-    omega = np.array([gas_components[name]['omega'] for name in gas_comp_names])
+    a_i, b_i = cubic_parameters(T, eq, gas_components)
 
-    m = params['m_func'](omega)
-    Tr = T / Tc
-    
-    alpha = np.zeros_like(Tr)
-    for i in range(len(gas_comp_names)):
-        alpha[i] = params['alpha_func'](Tr[i], m[i])
-    
-    a_i = params['Omega_a'] * (R**2 * Tc**2 / Pc) * alpha
-    b_i = params['Omega_b'] * (R * Tc / Pc)
-    
     a_ij = (1 - df_kij.values) * np.sqrt(np.outer(a_i, a_i))
     a_mix = np.sum(np.outer(y, y) * a_ij)
     b_mix = np.sum(y * b_i)
@@ -175,4 +222,123 @@ def fug(T,                          # Temperature K
         idx = comp_names.index(name)
         resultados_lista[idx] = phi_i[i] 
         
-    return resultados_lista
\ No newline at end of file
+    return resultados_lista
+
+def cubic_discriminant(c2, c1, c0):
+    """
+    Depressed form (p, q) and discriminant of Z^3 + c2*Z^2 + c1*Z + c0: one real root where the
+    discriminant is positive, three (some possibly repeated) otherwise.
+    """
+    p = c1 - c2**2 / 3
+    q = 2 * c2**3 / 27 - c2 * c1 / 3 + c0
+    return p, q, (q / 2)**2 + (p / 3)**3
+
+
+def cubic_three_roots(c2, c1, c0):
+    """
+    True where Z^3 + c2*Z^2 + c1*Z + c0 = 0 has three real roots.
+    """
+    return cubic_discriminant(*(np.asarray(c, dtype=float) for c in (c2, c1, c0)))[2] <= 0
+
+
+def cubic_largest_root(c2, c1, c0):
+    """
+    Largest real root of Z^3 + c2*Z^2 + c1*Z + c0 = 0, solved in closed form for arrays of coefficients
+    (Cardano when there is one real root, trigonometric form when there are three).
+    """
+    c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (c2, c1, c0)))
+    p, q, disc = cubic_discriminant(c2, c1, c0)
+
+    t = np.empty_like(p)
+    one_root = disc > 0
+    sqrt_disc = np.sqrt(np.where(one_root, disc, 0.0))
+    t[one_root] = np.cbrt(-q[one_root] / 2 + sqrt_disc[one_root]) + np.cbrt(-q[one_root] / 2 - sqrt_disc[one_root])
+
+    three_roots = ~one_root
+    p3 = np.minimum(p[three_roots], 0.0)
+    r = np.sqrt(-p3 / 3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_arg = np.where(r > 0, -q[three_roots] / (2 * r**3), 0.0)
+    t[three_roots] = 2 * r * np.cos(np.arccos(np.clip(cos_arg, -1.0, 1.0)) / 3)
+
+    return t - c2 / 3
+
+
+def fug_batch(T,                    # Temperatures K, shape (N,) or scalar
+              P,                    # Pressures bar, shape (N,) or scalar
+              Y,                    # Mols or molar fractions of every component, shape (N, ncomp)
+              eq,                   # Name of equation to calculate phi(V)
+              components,           # Thermodynamic data about components
+              kij_df: pd.DataFrame):
+    """
+    Vectorized fug(): fugacity coefficients of N states in one NumPy pass.
+    Returns an (N, ncomp) array, with phi = 1 for solids and NaN where no valid vapour root exists.
+
+    The mole fractions are taken over the gases only, as in the Gibbs NLP. Z is the largest real root
+    of the cubic, which is the root the NLP keeps: the vapour root when there are three real roots
+    (curvature constraint on) and the only root otherwise, liquid-like or not.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    N, num_all = Y.shape
+    T = np.broadcast_to(np.asarray(T, dtype=float), (N,))
+    P_pa = np.broadcast_to(np.asarray(P, dtype=float), (N,)) * 1e5
+
+    comp_names = list(components.keys())
+    phases = np.array([str(components[name].get('Phase', 'g')).lower() for name in comp_names])
+    gas_idx = np.flatnonzero(phases != 's')
+
+    phi = np.ones((N, num_all))
+    total_n = Y.sum(axis=1)
+    phi[total_n == 0] = np.nan
+
+    if gas_idx.size == 0 or eq == 'Ideal Gas':
+        return phi
+
+    gas_comp_names = [comp_names[i] for i in gas_idx]
+    gas_components = {name: components[name] for name in gas_comp_names}
+    df_kij = kij_df.reindex(index=gas_comp_names, columns=gas_comp_names, fill_value=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = Y[:, gas_idx] / Y[:, gas_idx].sum(axis=1)[:, None]
+
+    T_unique, T_inverse = np.unique(T, return_inverse=True)
+
+    if eq == 'Virial':
+        B_matrix = virial_matrix(T_unique, gas_components, df_kij)[T_inverse]
+        B_mix = np.einsum('ni,nij,nj->n', y, B_matrix, y)
+        sum_yB = np.einsum('nij,nj->ni', B_matrix, y)
+        ln_phi = (2 * sum_yB - B_mix[:, None]) * (P_pa / (R * T))[:, None]
+        phi[:, gas_idx] = np.exp(ln_phi)
+        return phi
+
+    if eq not in EOS_PARAMS:
+        raise ValueError(f"Equação de estado '{eq}' não suportada.")
+
+    params = EOS_PARAMS[eq]
+    a_unique, b_i = cubic_parameters(T_unique, eq, gas_components)
+    a_i = a_unique[T_inverse]
+
+    a_ij = (1 - df_kij.values)[None, :, :] * np.sqrt(a_i[:, :, None] * a_i[:, None, :])
+    sum_y_a_ij = np.einsum('nj,nij->ni', y, a_ij)
+    a_mix = np.einsum('ni,ni->n', y, sum_y_a_ij)
+    b_mix = y @ b_i
+
+    A = a_mix * P_pa / (R**2 * T**2)
+    B = b_mix * P_pa / (R * T)
+
+    _, c2, c1, c0 = params['Z_coeffs'](A, B)
+    Z = cubic_largest_root(c2, c1, c0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        term1 = (b_i[None, :] / b_mix[:, None]) * (Z - 1)[:, None]
+        term2 = -np.log(Z - B)[:, None]
+        term3_dyn = (2 * sum_y_a_ij / a_mix[:, None]) - (b_i[None, :] / b_mix[:, None])
+        term3_log = params['ln_phi_term'](Z, B)[:, None]
+        ln_phi = term1 + term2 - (A / B)[:, None] * term3_dyn * term3_log
+        gas_phi = np.exp(ln_phi)
+
+    invalid = ~(np.isfinite(Z) & (Z > 0) & (Z > B))
+    gas_phi[invalid] = np.nan
+    phi[:, gas_idx] = gas_phi
+    phi[total_n == 0] = np.nan
+    return phi
@@ -1,11 +1,64 @@
+import logging
+import os
+import re
 from app.find_path import resource_path
 import pyomo.environ as pyo
 
-def get_ipopt_solver():
+# 'ipopt' runs the ipopt executable through .nl/.sol files, 'cyipopt' calls the Ipopt library
+# in-process (no subprocess and no .sol file; Pyomo's PyomoNLP still writes a temporary .nl file and
+# rebuilds the NLP at every solve). Falls back to 'ipopt' when cyipopt is missing.
+SOLVER_BACKEND = os.environ.get('TES_SOLVER_BACKEND', 'ipopt')
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessIpopt:
+    """
+    Wraps Pyomo's cyipopt interface with the parts of the shell solver API used in TeS:
+    an options dict, solve(model, tee) and the iteration count of the last run.
+    Each solve still builds a new PyomoNLP from the model, which goes through a temporary .nl file;
+    what is saved is the ipopt subprocess and the .sol file.
+    """
+    def __init__(self):
+        self.options = {}
+        self.iterations = 0
+        self._solver = pyo.SolverFactory('cyipopt')
+
+    def available(self, exception_flag=False):
+        return self._solver.available(exception_flag=exception_flag)
+
+    def _count_iterations(self, nlp, problem, alg_mod, iter_count, obj_value, inf_pr, inf_du,
+                          mu, d_norm, regularization_size, alpha_du, alpha_pr, ls_trials):
+        self.iterations = iter_count
+        return True
+
+    def solve(self, model, tee=False):
+        self.iterations = 0
+        return self._solver.solve(model, tee=tee, options=dict(self.options),
+                                  intermediate_callback=self._count_iterations)
+
+
+def get_ipopt_solver(backend=None):
+    backend = backend or SOLVER_BACKEND
+    if backend == 'cyipopt':
+        solver = InProcessIpopt()
+        if solver.available(exception_flag=False):
+            return solver
+        logger.warning("cyipopt não está disponível. Utilizando o executável do IPOPT.")
+
     try:
         solver = pyo.SolverFactory('ipopt')
         return solver
     except:
-        solver = pyo.SolverFactory('ipopt', 
+        solver = pyo.SolverFactory('ipopt',
                                     executable = resource_path("app/solver/bin/ipopt.exe"))
-        return solver
\ No newline at end of file
+        return solver
+
+def ipopt_iterations(solver):
+    """
+    Returns the iteration count reported in the log of the last IPOPT run (0 when unavailable).
+    """
+    if isinstance(solver, InProcessIpopt):
+        return solver.iterations
+    match = re.search(r"Number of Iterations\.*:\s*(\d+)", getattr(solver, '_log', None) or '')
+    return int(match.group(1)) if match else 0
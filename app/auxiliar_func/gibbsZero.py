@@ -1,9 +1,55 @@
 import numpy as np
-from scipy.integrate import quad
+
+R = 8.314  # Gas constant in J/(mol·K)
+T0 = 298.15  # Reference temperature in Kelvin
+
+
+def cp_coefficients(components):
+    """
+    Collects the Cp coefficients and formation properties of all components as arrays.
+
+    Returns:
+    tuple: (a, b, c, d, deltaH, deltaG), each an array with one entry per component.
+    """
+    keys = ('a', 'b', 'c', 'd', '∆Hf298', '∆Gf298')
+    values = np.array([[component.get(key, 0) for key in keys] for component in components.values()], dtype=float)
+    values = values.reshape(-1, len(keys))
+    return tuple(values.T)
+
 
 def gibbs_pad(T, components):
     """
-    Calculates the chemical potential (mu_i) for the given components at a temperature T.
+    Calculates the chemical potential (mu_i) for the given components at a temperature T,
+    using the closed form of both integrals for Cp/R = a + b*T + c*T^2 + d/T^2.
+
+    Parameters:
+    T (float or array): Temperature(s) in Kelvin.
+    components (dict): Dictionary of components, each with its properties.
+
+    Returns:
+    np.ndarray: Chemical potentials, shape (ncomp,) for a scalar T or (nT, ncomp) for an array of temperatures.
+    """
+    a, b, c, d, deltaH, deltaG = cp_coefficients(components)
+    T_arr = np.asarray(T, dtype=float)
+    Tc = T_arr.reshape(-1, 1)
+
+    # H(T') = deltaH + R*(a*(T'-T0) + b/2*(T'^2-T0^2) + c/3*(T'^3-T0^3) - d*(1/T' - 1/T0))
+    # and the integral of H(T')/T'^2 from T0 to T in closed form.
+    K = deltaH + R * (-a * T0 - b / 2 * T0 ** 2 - c / 3 * T0 ** 3 + d / T0)
+    integral_value = K * (1 / T0 - 1 / Tc) + R * (
+        a * np.log(Tc / T0)
+        + b / 2 * (Tc - T0)
+        + c / 6 * (Tc ** 2 - T0 ** 2)
+        + d / 2 * (1 / Tc ** 2 - 1 / T0 ** 2)
+    )
+    mu = Tc * (deltaG / T0 - integral_value)
+
+    return mu[0] if T_arr.ndim == 0 else mu
+
+
+def gibbs_pad_quad(T, components):
+    """
+    Reference implementation of gibbs_pad with nested numerical integration (scipy quad).
 
     Parameters:
     T (float): Temperature in Kelvin.
@@ -12,9 +58,8 @@ def gibbs_pad(T, components):
     Returns:
     list: List of chemical potentials calculated for each component.
     """
-    R = 8.314  # Gas constant in J/(mol·K)
-    T0 = 298.15  # Reference temperature in Kelvin
-    
+    from scipy.integrate import quad
+
     results = []
 
     for component in components.values():
@@ -36,4 +81,4 @@ def gibbs_pad(T, components):
         mu_i = T * (deltaG / T0 - integral_value)
         results.append(mu_i)
 
-    return results
\ No newline at end of file
+    return results
@@ -0,0 +1,113 @@
+import logging
+import time
+from contextlib import nullcontext
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Phases of a point solve, in the order of the instrumentation columns:
+# build (Pyomo model construction), gibbs_pad, eos (EoS parameters), nl_write (.nl file written by
+# the IPOPT executable interface), solver (IPOPT or RAND run), sol_read (.sol file loaded back) and
+# results (solution values read from the model and stored in the point cache).
+PHASES = ('build', 'gibbs_pad', 'eos', 'nl_write', 'solver', 'sol_read', 'results')
+_PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+
+# Status of a solved point. Points of robust sweeps solved by a retry carry the rung that succeeded
+# (see app.auxiliar_func.retry); failed and timeout points are stored as NaN.
+STATUS_CODES = {'optimal': 0, 'cached': 1, 'failed': 2, 'timeout': 3,
+                'warm_start': 4, 'relaxed_bounds': 5, 'mu_strategy': 6, 'scaling': 7}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+INSTRUMENTATION_COLUMNS = [f'{phase} time (s)' for phase in PHASES] + ['Solver iterations', 'Solve status']
+
+_DISABLED = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('timings', 'index', 'start')
+
+    def __init__(self, timings, index):
+        self.timings = timings
+        self.index = index
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings[self.index] += time.perf_counter() - self.start
+        return False
+
+
+class Instrumentation:
+    """
+    Per-point record of the time spent in each phase of a solve, the solver iterations (IPOPT
+    iterations or RAND Newton steps) and the solve status. When disabled, phase() returns a shared no-op context manager, so the timed
+    blocks cost one method call.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start_point()
+
+    def start_point(self):
+        self.timings = [0.0] * len(PHASES)
+        self.iterations = 0
+        self.status = STATUS_CODES['optimal']
+
+    def phase(self, name):
+        if not self.enabled:
+            return _DISABLED
+        return _Phase(self.timings, _PHASE_INDEX[name])
+
+    def record(self):
+        """
+        Returns the values of the point in the order of INSTRUMENTATION_COLUMNS.
+        """
+        return np.array(self.timings + [self.iterations, self.status], dtype=float)
+
+
+def instrument_solver(solver, instrumentation):
+    """
+    Times the steps of a solver inside the phases of instrumentation. The IPOPT executable interface
+    is split into nl_write, solver and sol_read; any other solver (e.g. cyipopt) is timed as solver.
+    """
+    if not instrumentation.enabled:
+        return solver
+
+    def timed(method, phase):
+        def call(*args, **kwargs):
+            with instrumentation.phase(phase):
+                return method(*args, **kwargs)
+        return call
+
+    if all(hasattr(solver, name) for name in ('_presolve', '_apply_solver', '_postsolve')):
+        solver._presolve = timed(solver._presolve, 'nl_write')
+        solver._apply_solver = timed(solver._apply_solver, 'solver')
+        solver._postsolve = timed(solver._postsolve, 'sol_read')
+    else:
+        solver.solve = timed(solver.solve, 'solver')
+    return solver
+
+
+def instrumentation_summary(results, run_timings=None):
+    """
+    Side table of an instrumented sweep: total and mean time per point of each phase and its share
+    of the solve time, followed by the run-level timings (s) of the runner, when given.
+    """
+    times = results[[f'{phase} time (s)' for phase in PHASES]].to_numpy()
+    total = times.sum(axis=0)
+    summary = pd.DataFrame({'total (s)': total, 'mean per point (s)': times.mean(axis=0) if len(times) else np.nan,
+                            'share (%)': 100 * total / total.sum() if total.sum() > 0 else np.nan}, index=list(PHASES))
+    if run_timings:
+        run = pd.DataFrame({'total (s)': list(run_timings.values())}, index=list(run_timings))
+        summary = pd.concat([summary, run])
+    return summary
+
+
+def log_instrumentation(results, run_timings=None):
+    summary = instrumentation_summary(results, run_timings)
+    status = results['Solve status'].value_counts()
+    counts = ', '.join(f"{STATUS_NAMES.get(int(code), code)}: {count}" for code, count in status.items())
+    logger.info("Instrumentação da varredura (%d pontos, %d iterações do solver, %s):\n%s",
+                len(results), int(results['Solver iterations'].sum()), counts, summary.to_string(float_format=lambda x: f'{x:.4g}'))
+    return summary
@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+# One Gibbs/Entropy instance per worker process, created by the pool initializer.
+_worker = {}
+
+
+def available_workers():
+    return os.cpu_count() or 1
+
+
+def _init_worker(runner):
+    _worker['runner'] = runner
+    _worker['instance'] = runner.create_instance()
+
+
+def _solve_chunk(chunk):
+    runner = _worker['runner']
+    instance = _worker['instance']
+    iterations = getattr(instance, 'total_iterations', 0)
+    results = [(idx, runner.solve_point(instance, *point)) for idx, point in chunk]
+    return results, getattr(instance, 'total_iterations', 0) - iterations
+
+
+def split_chunks(tasks, workers, chunk_size=None):
+    """
+    Splits the task list into contiguous chunks, about four per worker and at most 64 points each
+    (so progress and cancellation stay responsive) unless chunk_size is given.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, min(64, -(-len(tasks) // (workers * 4))))
+    return [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+
+def worker_pool(runner, workers):
+    """
+    Process pool whose workers each hold one instance of runner.create_instance(). It can be passed
+    to several solve_points calls (e.g. the passes of an adaptive sweep), so the instances are reused.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(runner,))
+
+
+def solve_points(runner, tasks, workers=1, chunk_size=None, callback=None, should_stop=None, instance=None, executor=None):
+    """
+    Solves a list of (index, point) tasks with runner.solve_point, where point is the tuple of
+    arguments after the Gibbs/Entropy instance. The runner must also provide create_instance().
+
+    Returns the (index, result) pairs in task order, whatever order the chunks finish in,
+    and the IPOPT iterations spent. With a callback, each result is passed to callback(result, index)
+    as soon as it is available and is not kept in the returned list.
+
+    should_stop() is polled between points (between chunks in parallel runs); when it returns True
+    the remaining points are skipped and the results solved so far are returned. When a point raises,
+    the chunks not yet started are cancelled before the exception reaches the caller.
+
+    instance (serial runs) and executor (a worker_pool, parallel runs) let the caller reuse the
+    solver instances across calls; otherwise they are created for this call only.
+    """
+    if executor is None and (workers is None or workers <= 1 or len(tasks) <= 1):
+        if instance is None:
+            instance = runner.create_instance()
+        start_iterations = getattr(instance, 'total_iterations', 0)
+        results = []
+        for idx, point in tasks:
+            if should_stop is not None and should_stop():
+                break
+            result = runner.solve_point(instance, *point)
+            if callback is None:
+                results.append((idx, result))
+            else:
+                callback(result, idx)
+        return results, getattr(instance, 'total_iterations', 0) - start_iterations
+
+    workers = min(workers, len(tasks))
+    chunks = split_chunks(tasks, workers, chunk_size)
+
+    results = []
+    iterations = 0
+    owned = executor is None
+    if owned:
+        executor = worker_pool(runner, workers)
+    futures = []
+    finished = False
+    try:
+        futures = [executor.submit(_solve_chunk, chunk) for chunk in chunks]
+        for future in futures:
+            chunk_results = None
+            while chunk_results is None:
+                if should_stop is not None and should_stop():
+                    return results, iterations
+                try:
+                    chunk_results, chunk_iterations = future.result(timeout=0.2)
+                except TimeoutError:
+                    pass
+            if callback is None:
+                results.extend(chunk_results)
+            else:
+                for idx, result in chunk_results:
+                    callback(result, idx)
+            iterations += chunk_iterations
+        finished = True
+    finally:
+        if not finished:
+            # Stopped, or a failed chunk (or callback): the queued chunks must not run.
+            for future in futures:
+                future.cancel()
+        if owned:
+            executor.shutdown(wait=finished, cancel_futures=not finished)
+
+    return results, iterations
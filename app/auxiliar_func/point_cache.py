@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import time
+import numpy as np
+from app.auxiliar_func.property_cache import data_key
+
+# Path of the on-disk cache of solved points used when none is given explicitly (disabled when unset).
+POINT_CACHE_PATH = os.environ.get('TES_POINT_CACHE')
+
+
+class PointCache:
+    """
+    Persistent store of solved equilibrium points in a SQLite file, keyed by a hash of everything
+    that defines the solution (see point_key). Holds at most max_entries points; when full, the
+    least recently used tenth is evicted.
+
+    The connection is opened on first use, so instances can be passed to worker processes and
+    several processes can share the same file.
+    """
+    def __init__(self, path=None, max_entries=200000):
+        self.path = path or POINT_CACHE_PATH
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._count = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS points (key TEXT PRIMARY KEY, value BLOB, used REAL)')
+            self._count = self._connection.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+        return self._connection
+
+    def get(self, key):
+        """
+        Returns the stored values of the point (array), or None.
+        """
+        connection = self.connection
+        row = connection.execute('SELECT value FROM points WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with connection:
+            connection.execute('UPDATE points SET used = ? WHERE key = ?', (time.time(), key))
+        return np.frombuffer(row[0], dtype=float).copy()
+
+    def put(self, key, values):
+        connection = self.connection
+        value = np.asarray(values, dtype=float).tobytes()
+        with connection:
+            inserted = connection.execute('INSERT OR IGNORE INTO points VALUES (?, ?, ?)', (key, value, time.time())).rowcount
+            if not inserted:
+                connection.execute('UPDATE points SET value = ?, used = ? WHERE key = ?', (value, time.time(), key))
+        self._count += inserted
+        if self._count > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        connection = self.connection
+        with connection:
+            count = connection.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+            excess = count - int(0.9 * self.max_entries)
+            if excess > 0:
+                connection.execute('DELETE FROM points WHERE key IN (SELECT key FROM points ORDER BY used LIMIT ?)', (excess,))
+            self._count = connection.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute('DELETE FROM points')
+        self._count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': self._count, 'max_entries': self.max_entries, 'path': self.path}
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def open_point_cache(path=None, max_entries=200000):
+    """
+    Returns a PointCache on path (or on TES_POINT_CACHE), or None when neither is set.
+    """
+    path = path or POINT_CACHE_PATH
+    return PointCache(path, max_entries) if path else None
+
+
+def point_key(kind, data_hash, kij, equation, inhibited_component, options, initial, T, P):
+    """
+    Returns the content address of an equilibrium point: the kind of calculation ('gibbs' or
+    'entropy'), the component data hash, kij, EoS, inhibited component, solver options, feed, T and P.
+    Numbers are taken to 12 significant digits, so grids that only differ by rounding share points.
+    """
+    feed = [_key_number(value) for value in np.asarray(initial, dtype=float)]
+    inhibited = None if inhibited_component in (None, '---') else inhibited_component
+    return data_key(kind, data_hash, kij, equation, inhibited, sorted(options.items()), feed, _key_number(T), _key_number(P))
+
+
+def _key_number(value):
+    return float(f'{float(value):.12g}')
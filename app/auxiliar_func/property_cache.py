@@ -0,0 +1,65 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+def data_key(*records):
+    """
+    Returns a stable hash of component records (dicts) and parameter tables (DataFrames),
+    used to tell apart the property sets stored in the cache.
+    """
+    digest = hashlib.sha1()
+    for record in records:
+        if isinstance(record, pd.DataFrame):
+            digest.update(repr((list(record.index), list(record.columns))).encode())
+            digest.update(np.ascontiguousarray(record.to_numpy(dtype=float)).tobytes())
+        else:
+            digest.update(repr(record).encode())
+    return digest.hexdigest()
+
+
+class PropertyCache:
+    """
+    Bounded LRU store for temperature-dependent properties, keyed by
+    (property name, T, hash of the component data).
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def get(self, name, T, key, compute):
+        """
+        Returns the cached value of property 'name' at temperature T (None for temperature-independent
+        values), calling compute() on a miss. Cached values are shared between callers and must not be modified.
+        """
+        cache_key = (name, None if T is None else float(T), key)
+        try:
+            value = self._store[cache_key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._store[cache_key] = value
+            if len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+            return value
+
+        self.hits += 1
+        self._store.move_to_end(cache_key)
+        return value
+
+    def clear(self):
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._store), 'maxsize': self.maxsize}
+
+
+# Shared by Gibbs, Entropy and the EoS code within a process.
+property_cache = PropertyCache()
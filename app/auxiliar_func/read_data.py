@@ -1,27 +1,143 @@
+import hashlib
+import importlib.util
+import json
+import logging
 import pandas as pd
 import os
 
+# Bumped whenever the layout of the cached sheets changes.
+CACHE_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+def cache_directory():
+    """
+    Per-user directory of the parsed-sheet cache; TES_CACHE_DIR overrides the platform default.
+    """
+    directory = os.environ.get('TES_CACHE_DIR')
+    if directory:
+        return directory
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'TeS', 'read_data')
+
+
+def frame_to_json(frame):
+    """
+    Plain-JSON form of a sheet. Only numeric, boolean and object columns are supported; json keeps
+    floats exact, so the sheet read back is equal to the parsed one.
+    """
+    for dtype in frame.dtypes:
+        if dtype.kind not in 'biufO':
+            raise TypeError(f"Tipo de coluna não suportado no cache: {dtype}")
+    index = frame.index
+    plain_index = isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+    return {
+        'columns': frame.columns.tolist(),
+        'dtypes': [str(dtype) for dtype in frame.dtypes],
+        'index': None if plain_index else index.tolist(),
+        'index_name': index.name,
+        'data': [frame.iloc[:, i].tolist() for i in range(frame.shape[1])],
+    }
+
+
+def frame_from_json(stored):
+    index = None if stored['index'] is None else pd.Index(stored['index'], name=stored['index_name'])
+    frame = pd.DataFrame({i: pd.Series(values, dtype=dtype, index=index)
+                          for i, (values, dtype) in enumerate(zip(stored['data'], stored['dtypes']))}, index=index)
+    frame.columns = stored['columns']
+    return frame
+
+
 class ReadData():
-    def __init__(self, path):
+    def __init__(self, path, use_cache=True):
         if not os.path.exists(path):
             raise FileNotFoundError(f"O arquivo especificado não foi encontrado em: {path}")
-        
+
         self.path = path
         self.file_extension = os.path.splitext(self.path)[1].lower()
-        
-        self.dataframe = None 
+        self.use_cache = use_cache
+
+        self.dataframe = None
+        self.sheets = self.load_sheets()
         self.data, self.species, self.initial, self.components = self.get_infos()
-        
+
         self.kij = self.load_kij()
 
-    def get_infos(self):
+    def cache_path(self):
+        """
+        Path of the cached sheets of the input file, in the per-user cache directory.
+        """
+        name = hashlib.sha256(os.path.abspath(self.path).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(cache_directory(), f"{name}.json")
+
+    def cache_key(self):
+        stat = os.stat(self.path)
+        return [CACHE_VERSION, os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size]
+
+    def load_sheets(self):
+        """
+        Returns the parsed sheets ('Informations' and, for Excel files, 'kij'), read from the cache
+        when the input file did not change (same path, mtime and size) and from the file otherwise.
+        The cache is plain JSON, so a tampered cache file cannot run code.
+        """
+        key = self.cache_key()
+        if self.use_cache:
+            try:
+                with open(self.cache_path(), encoding='utf-8') as file:
+                    cached = json.load(file)
+                if cached['key'] == key:
+                    return {'Informations': frame_from_json(cached['Informations']),
+                            'kij': None if cached['kij'] is None else frame_from_json(cached['kij']),
+                            'kij_error': cached['kij_error']}
+            except Exception:
+                pass
+
+        sheets = self.read_sheets()
+
+        if self.use_cache:
+            path = self.cache_path()
+            try:
+                cached = {'key': key,
+                          'Informations': frame_to_json(sheets['Informations']),
+                          'kij': None if sheets['kij'] is None else frame_to_json(sheets['kij']),
+                          'kij_error': sheets['kij_error']}
+                os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+                with open(f"{path}.{os.getpid()}.tmp", 'w', encoding='utf-8') as file:
+                    json.dump(cached, file)
+                os.replace(f"{path}.{os.getpid()}.tmp", path)
+            except (OSError, TypeError, ValueError):
+                # Sem permissão de escrita ou planilha com tipos não suportados: segue sem cache
+                pass
+        return sheets
+
+    def read_sheets(self):
+        """
+        Reads both sheets from a single open of the workbook.
+        """
+        sheets = {'Informations': None, 'kij': None, 'kij_error': None}
         try:
             if self.file_extension in ['.xls', '.xlsx']:
-                full_data = pd.read_excel(self.path, sheet_name='Informations')
+                with pd.ExcelFile(self.path) as workbook:
+                    sheets['Informations'] = workbook.parse('Informations')
+                    if 'kij' in workbook.sheet_names:
+                        try:
+                            sheets['kij'] = workbook.parse('kij', index_col=0)
+                        except Exception as e:
+                            sheets['kij_error'] = str(e)
             else:
-                full_data = pd.read_csv(self.path)
+                # pyarrow parses CSV faster when installed; it is not imported otherwise.
+                engine = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+                sheets['Informations'] = pd.read_csv(self.path, engine=engine)
         except Exception as e:
             raise ValueError(f"Não foi possível ler os dados principais do arquivo: {e}")
+        return sheets
+
+    def get_infos(self):
+        full_data = self.sheets['Informations']
 
         self.dataframe = full_data
         required_columns = ['Component', 'initial', 'C']
@@ -29,28 +145,24 @@ class ReadData():
             if col not in full_data.columns:
                 raise KeyError(f"Coluna obrigatória '{col}' não encontrada no arquivo de entrada.")
 
-        initial = full_data['initial'].values 
-        components = full_data['Component'].values 
+        initial = full_data['initial'].values
+        components = full_data['Component'].values
         species = full_data.columns[full_data.columns.get_loc("C"):]
-        
-        data_dict = {row['Component']: row.to_dict() for index, row in full_data.iterrows()}
+
+        data_dict = dict(zip(components, full_data.to_dict('records')))
 
         return data_dict, species, initial, components
 
     def load_kij(self):
         if self.file_extension in ['.xls', '.xlsx']:
-            try:
-                df_kij = pd.read_excel(self.path, sheet_name='kij', index_col=0)
-                
-                df_kij = df_kij.reindex(index=self.components, columns=self.components, fill_value=0)
-                return df_kij
-
-            except ValueError:
-                print("Aviso: Aba 'kij' não encontrada no arquivo Excel. Assumindo todos os kij = 0.")
-                return pd.DataFrame(0, index=self.components, columns=self.components)
-            except Exception as e:
-                print(f"Erro ao ler a aba 'kij': {e}. Assumindo todos os kij = 0.")
-                return pd.DataFrame(0, index=self.components, columns=self.components)
+            df_kij = self.sheets['kij']
+            if df_kij is not None:
+                return df_kij.reindex(index=self.components, columns=self.components, fill_value=0)
+            if self.sheets['kij_error'] is not None:
+                logger.error("Erro ao ler a aba 'kij': %s. Assumindo todos os kij = 0.", self.sheets['kij_error'])
+            else:
+                logger.warning("Aba 'kij' não encontrada no arquivo Excel. Assumindo todos os kij = 0.")
+            return pd.DataFrame(0, index=self.components, columns=self.components)
         else:
-            print("Aviso: O arquivo não é um Excel, portanto não há aba 'kij'. Assumindo todos os kij = 0.")
-            return pd.DataFrame(0, index=self.components, columns=self.components)
\ No newline at end of file
+            logger.warning("O arquivo não é um Excel, portanto não há aba 'kij'. Assumindo todos os kij = 0.")
+            return pd.DataFrame(0, index=self.components, columns=self.components)
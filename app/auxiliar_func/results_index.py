@@ -0,0 +1,34 @@
+import numpy as np
+
+
+class ResultsIndex:
+    """
+    Indexed view of a results DataFrame for the composition plots, which fix two of the sweep axes
+    (T, P, n) and plot against the third.
+
+    For each (label1, label2, x_label) asked for, the row order sorted by label1, label2 and x_label is
+    computed once (O(N log N)); every later slice is two binary searches over the sorted keys
+    (O(log N)) plus the copy of the rows found, already ordered by x_label.
+    """
+    def __init__(self, frame):
+        self.frame = frame
+        self._orders = {}
+
+    def _sorted(self, label1, label2, x_label):
+        key = (label1, label2, x_label)
+        if key not in self._orders:
+            keys1 = self.frame[label1].to_numpy()
+            keys2 = self.frame[label2].to_numpy()
+            order = np.lexsort((self.frame[x_label].to_numpy(), keys2, keys1))
+            self._orders[key] = (order, keys1[order], keys2[order])
+        return self._orders[key]
+
+    def slice(self, label1, value1, label2, value2, x_label):
+        """
+        Rows with label1 == value1 and label2 == value2, sorted by x_label.
+        """
+        order, keys1, keys2 = self._sorted(label1, label2, x_label)
+        start, stop = np.searchsorted(keys1, value1, 'left'), np.searchsorted(keys1, value1, 'right')
+        block = keys2[start:stop]
+        start, stop = start + np.searchsorted(block, value2, 'left'), start + np.searchsorted(block, value2, 'right')
+        return self.frame.iloc[order[start:stop]]
@@ -0,0 +1,239 @@
+import logging
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNAR_FORMATS = ('.parquet', '.arrow', '.feather')
+
+logger = logging.getLogger(__name__)
+
+
+class ResultsWriter:
+    """
+    Appends sweep results to a columnar file while the sweep runs, in chunks of chunk_size rows.
+    The format follows the file extension: '.parquet', '.arrow'/'.feather' (Arrow IPC) or '.csv'.
+    Without pyarrow, columnar paths are written as CSV next to the requested path.
+
+    A columnar file is only readable once its footer is written, so each chunk is written as a
+    complete file in the '<path>.parts' directory, and close() merges the parts into path. After a
+    crash the parts already written stay readable (see recover_results); CSV is appended in place.
+
+    Rows are dicts, or sequences in the order of columns. They may be written with their grid
+    index; they are then kept until all earlier rows arrived, so the file follows the grid order
+    whatever order the points were solved in.
+    """
+    def __init__(self, path, columns=None, chunk_size=1024):
+        if os.path.splitext(path)[1].lower() in COLUMNAR_FORMATS and pa is None:
+            logger.warning("pyarrow não está disponível. Os resultados serão salvos em CSV.")
+        path = writer_path(path)
+        extension = os.path.splitext(path)[1].lower()
+
+        self.path = path
+        self.format = extension if extension in COLUMNAR_FORMATS else '.csv'
+        self.chunk_size = chunk_size
+        self.columns = None if columns is None else list(columns)
+        self.rows_written = 0
+        self._rows = []
+        self._pending = {}
+        self._next_index = 0
+        self._parts = 0
+        if self.format != '.csv':
+            # Parts left by an earlier run to the same path belong to results this run replaces.
+            shutil.rmtree(parts_directory(path), ignore_errors=True)
+
+    def write(self, row, index=None):
+        if index is None:
+            self._append(row)
+            return
+        self._pending[index] = row
+        while self._next_index in self._pending:
+            self._append(self._pending.pop(self._next_index))
+            self._next_index += 1
+
+    def _append(self, row):
+        if self.columns is None:
+            self.columns = list(row)
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        chunk = pd.DataFrame(self._rows, columns=self.columns, dtype=float)
+        self._rows = []
+
+        if self.format == '.csv':
+            chunk.to_csv(self.path, mode='a' if self.rows_written else 'w', header=not self.rows_written, index=False)
+        else:
+            directory = parts_directory(self.path)
+            os.makedirs(directory, exist_ok=True)
+            part = os.path.join(directory, f"part-{self._parts:06d}{self.format}")
+            self._parts += 1
+            write_table(pa.Table.from_pandas(chunk, preserve_index=False), part + '.tmp', self.format)
+            os.replace(part + '.tmp', part)
+        self.rows_written += len(chunk)
+
+    def close(self):
+        # Rows still waiting for an earlier index are written as they are.
+        for index in sorted(self._pending):
+            self._append(self._pending.pop(index))
+        self.flush()
+        if self.format != '.csv':
+            recover_results(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def parts_directory(path):
+    return path + '.parts'
+
+
+def part_files(path):
+    """
+    Returns the part files written by ResultsWriter for path, in write order.
+    """
+    directory = parts_directory(path)
+    if not os.path.isdir(directory):
+        return []
+    extension = os.path.splitext(path)[1].lower()
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(extension)]
+
+
+def write_table(table, path, extension):
+    if extension == '.parquet':
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def recover_results(path):
+    """
+    Merges the part files of a columnar results file into path and removes them. Used by
+    ResultsWriter.close() and to recover the rows written before a sweep was interrupted.
+    Returns the number of rows merged (0 when there are no parts).
+    """
+    parts = part_files(path)
+    if not parts:
+        return 0
+    extension = os.path.splitext(path)[1].lower()
+    temporary = parts_directory(path) + '.tmp'
+    rows = 0
+    writer = None
+    sink = None
+    try:
+        for part in parts:
+            table = read_table(part, extension)
+            if writer is None:
+                if extension == '.parquet':
+                    writer = pq.ParquetWriter(temporary, table.schema)
+                else:
+                    sink = pa.OSFile(temporary, 'wb')
+                    writer = pa.ipc.new_file(sink, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+        if sink is not None:
+            sink.close()
+    os.replace(temporary, path)
+    shutil.rmtree(parts_directory(path), ignore_errors=True)
+    return rows
+
+
+def read_table(path, extension):
+    if extension == '.parquet':
+        return pq.read_table(path)
+    with pa.OSFile(path) as sink:
+        return pa.ipc.open_file(sink).read_all()
+
+
+def columnar_sources(source):
+    """
+    Files holding the results of a columnar path: the parts written so far when a sweep was
+    interrupted before close() (they are newer than any file left at the path), otherwise the file.
+    """
+    return part_files(source) or [source]
+
+
+def writer_path(path):
+    """
+    Returns the path ResultsWriter actually writes for path (the CSV fallback without pyarrow).
+    """
+    if os.path.splitext(path)[1].lower() in COLUMNAR_FORMATS and pa is None:
+        return os.path.splitext(path)[0] + '.csv'
+    return path
+
+
+def result_columns(source):
+    """
+    Returns the column names of a results DataFrame or file without reading its data.
+    """
+    if isinstance(source, pd.DataFrame):
+        return list(source.columns)
+    extension = os.path.splitext(source)[1].lower()
+    if extension == '.parquet':
+        return list(pq.ParquetFile(columnar_sources(source)[0]).schema_arrow.names)
+    if extension in ('.arrow', '.feather'):
+        with pa.memory_map(columnar_sources(source)[0]) as sink:
+            return list(pa.ipc.open_file(sink).schema.names)
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def read_results(source, columns=None):
+    """
+    Returns the results as a DataFrame, reading only the given columns.
+
+    Parameters:
+    source (DataFrame or str): Results frame or path of a file written by ResultsWriter.
+    columns (list): Columns to load; all columns when None.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source if columns is None else source[columns]
+    extension = os.path.splitext(source)[1].lower()
+    if extension == '.parquet':
+        return pd.concat([pd.read_parquet(path, columns=columns) for path in columnar_sources(source)], ignore_index=True)
+    if extension in ('.arrow', '.feather'):
+        tables = [read_table(path, extension) for path in columnar_sources(source)]
+        table = pa.concat_tables(tables)
+        return (table if columns is None else table.select(columns)).to_pandas()
+    return pd.read_csv(source, usecols=columns)
+
+
+def iter_results(source, columns=None, batch_size=65536):
+    """
+    Yields the results file as DataFrames of at most batch_size rows.
+    """
+    if isinstance(source, pd.DataFrame):
+        frame = read_results(source, columns)
+        for start in range(0, len(frame), batch_size):
+            yield frame.iloc[start:start + batch_size]
+        return
+    extension = os.path.splitext(source)[1].lower()
+    if extension == '.parquet':
+        for path in columnar_sources(source):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+                yield batch.to_pandas()
+    elif extension in ('.arrow', '.feather'):
+        for path in columnar_sources(source):
+            with pa.memory_map(path) as sink:
+                reader = pa.ipc.open_file(sink)
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    yield (batch if columns is None else batch.select(columns)).to_pandas()
+    else:
+        yield from pd.read_csv(source, usecols=columns, chunksize=batch_size)
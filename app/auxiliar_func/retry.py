@@ -0,0 +1,76 @@
+import logging
+import time
+import numpy as np
+from app.auxiliar_func.instrumentation import STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# Rungs tried, in this order, after a failed solve of a robust sweep. Each rung keeps the changes of
+# the previous ones: start from the last solved point, relax the bounds and balance tolerances, switch
+# IPOPT to the adaptive barrier update and scale the objective to order one.
+RETRY_LADDER = ('warm_start', 'relaxed_bounds', 'mu_strategy', 'scaling')
+
+# IPOPT options set by the ladder (and by the time budget); removed again before a regular solve.
+RETRY_OPTIONS = ('mu_strategy', 'obj_scaling_factor', 'max_cpu_time')
+
+RELAXED_LOWER_BOUND = 1e-12
+RELAXED_UPPER_MARGIN = 1e-3
+RELAXED_TOLERANCE = 1e-4
+
+
+def relax_bounds(bnds):
+    """
+    Widens the (lower, upper) bounds of the mols for the relaxed_bounds rung.
+    """
+    return tuple((RELAXED_LOWER_BOUND, upper * (1 + RELAXED_UPPER_MARGIN)) for _, upper in bnds)
+
+
+def set_retry_options(solver, retry, objective_scale=None, time_limit=None):
+    """
+    Sets the IPOPT options of the active rungs and of the time budget (s) of the attempt,
+    clearing the ones left by a previous attempt.
+    """
+    for option in RETRY_OPTIONS:
+        solver.options.pop(option, None)
+    if 'mu_strategy' in retry:
+        solver.options['mu_strategy'] = 'adaptive'
+    if 'scaling' in retry and objective_scale:
+        solver.options['obj_scaling_factor'] = objective_scale
+    if time_limit is not None:
+        solver.options['max_cpu_time'] = max(time_limit, 1e-2)
+
+
+def solve_with_retries(solve, time_limit=None):
+    """
+    Calls solve(retry, time_left) with no rung active and, while it raises, again with each rung of
+    RETRY_LADDER added in turn. time_left is what is left of time_limit (s) for the point, or None.
+
+    Returns the result and the status: 'optimal' (first attempt), the name of the rung that succeeded,
+    'failed' when every rung failed or 'timeout' when the time budget ran out first (result None).
+    """
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    retry = ()
+    for rung in (None,) + RETRY_LADDER:
+        if rung is not None:
+            retry += (rung,)
+        time_left = None if deadline is None else deadline - time.monotonic()
+        if time_left is not None and time_left <= 0:
+            return None, 'timeout'
+        try:
+            return solve(retry, time_left), rung or 'optimal'
+        except Exception as error:
+            logger.debug("Tentativa '%s' falhou: %s", rung or 'inicial', error)
+    return None, 'failed'
+
+
+def log_failures(statuses):
+    """
+    Logs how many points of a robust sweep needed a retry or were left unsolved (NaN).
+    """
+    statuses = np.asarray(statuses)
+    failed = int(np.isin(statuses, [STATUS_CODES['failed'], STATUS_CODES['timeout']]).sum())
+    retried = int(np.isin(statuses, [STATUS_CODES[rung] for rung in RETRY_LADDER]).sum())
+    if retried:
+        logger.info("%d pontos convergiram após novas tentativas.", retried)
+    if failed:
+        logger.warning("%d pontos não convergiram e foram registrados como NaN.", failed)
@@ -1,11 +1,26 @@
+import logging
+import time
 import pandas as pd
 import numpy as np
 from app.entropy import Entropy
+from app.auxiliar_func.parallel import solve_points
+from app.auxiliar_func.adaptive import adaptive_sweep
+from app.auxiliar_func.results_writer import ResultsWriter
+from app.auxiliar_func.point_cache import open_point_cache
+from app.auxiliar_func.checkpoint import Checkpoint
+from app.auxiliar_func.property_cache import data_key
+from app.auxiliar_func.instrumentation import INSTRUMENTATION_COLUMNS, log_instrumentation
+from app.auxiliar_func.retry import log_failures
+
+logger = logging.getLogger(__name__)
 
 class RunEntropy():
     def __init__(self, data, species, initial, components, Tmin, Tmax, Pmin, Pmax, nT, nP, 
                  reference_componente=None, reference_componente_min=None, reference_componente_max=None, n_reference_componente=None, inhibit_component=None,
-                 state_equation='Ideal Gas'):
+                 state_equation='Ideal Gas', workers=1,
+                 adaptive=False, adaptive_tol=1e-2, max_points=None, output_path=None,
+                 cache_path=None, checkpoint_path=None, checkpoint_every=100, resume=False,
+                 progress_callback=None, instrument=False, robust=False, point_time_limit=None, sweep_time_limit=None):
         self.data = data
         self.species = species
         self.initial = np.array(initial)
@@ -22,13 +37,61 @@ class RunEntropy():
         self.reference_componente_max = reference_componente_max
         self.n_reference_componente = n_reference_componente
         self.state_equation = state_equation
+        self.workers = workers
+        self.adaptive = adaptive
+        self.adaptive_tol = adaptive_tol
+        self.max_points = max_points
+        self.output_path = output_path
+        self.cache_path = cache_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.resume = resume
+        self.recovered = 0
+        self.remaining = 0
+        self.progress_callback = progress_callback
+        self.instrument = instrument
+        self.run_timings = {}
+        self.robust = robust
+        self.point_time_limit = point_time_limit
+        self.sweep_time_limit = sweep_time_limit
+        self.timed_out = False
+        self._deadline = None
+        self.cancelled = False
+
+    def __getstate__(self):
+        # The progress callback usually belongs to the GUI and is not sent to worker processes.
+        state = self.__dict__.copy()
+        state['progress_callback'] = None
+        return state
+
+    def cancel(self):
+        """
+        Asks a running sweep to stop after the points in progress; the points already solved are kept.
+        """
+        self.cancelled = True
+
+    def should_stop(self):
+        if self._deadline is not None and not self.timed_out and time.monotonic() > self._deadline:
+            self.timed_out = True
+            logger.warning("Tempo limite da varredura (%s s) atingido: os pontos restantes não serão resolvidos.", self.sweep_time_limit)
+        return self.cancelled or self.timed_out
+
+    def extra_columns(self):
+        """
+        Optional columns after the results: the instrumentation, or only the solve status in robust sweeps.
+        """
+        if self.instrument:
+            return INSTRUMENTATION_COLUMNS
+        if self.robust:
+            return ['Solve status']
+        return []
 
     def format_data(self):
         if self.reference_componente is not None and self.reference_componente != '---':
             try:
                 reference_index = np.where(self.components == self.reference_componente)[0][0]
             except IndexError:
-                print(f"Erro: Componente de referência '{self.reference_componente}' não encontrado na lista de componentes.")
+                logger.error("Componente de referência '%s' não encontrado na lista de componentes.", self.reference_componente)
                 reference_index = None
                 n = None
             else:
@@ -42,33 +105,145 @@ class RunEntropy():
 
         return T, P, n, reference_index
     
-    def run_entropy(self):
-        gibbs = Entropy(self.data, self.species, self.components, self.inhibit_component, self.state_equation)
+    def grid_points(self, T_vals, P_vals, n_vals):
+        """
+        Returns the (T, P, n) points of the sweep in the row order of the results frame.
+        """
+        n_axis = n_vals if n_vals is not None else [None]
+        return [(T, P, n) for T in T_vals for P in P_vals for n in n_axis]
+
+    def create_instance(self):
+        return Entropy(self.data, self.species, self.components, self.inhibit_component, self.state_equation,
+                       point_cache=open_point_cache(self.cache_path), instrument=self.instrument)
+
+    def solve_point(self, entropy, T, P, n, reference_index):
+        if reference_index is not None:
+            initial = self.initial.astype(float).copy()
+            initial[reference_index] = n
+        else:
+            initial = self.initial
+        if self.robust:
+            result, Teq = entropy.solve_entropy_robust(initial, T, P, time_limit=self.point_time_limit)
+        else:
+            result, Teq = entropy.solve_entropy(initial, T, P)
+        if self.instrument:
+            return np.concatenate([result, [Teq], entropy.instrumentation.record()])
+        if self.robust:
+            return np.concatenate([result, [Teq, entropy.instrumentation.status]])
+        return np.append(np.asarray(result, dtype=float), Teq)
+
+    def result_columns(self, reference_index):
+        columns = list(self.components)
+        if reference_index is not None:
+            columns += [self.components[reference_index] + ' Initial', 'Equilibrium Temperature (K)']
+        columns += ['Initial Temperature', 'Pressure']
+        return columns + self.extra_columns()
+
+    def result_rows(self, points, values, reference_index):
+        """
+        Joins the solved mols and equilibrium temperature (one row per point) with the point
+        coordinates, in the order of result_columns.
+        """
+        ncomp = len(self.components)
+        coords = np.array([point if reference_index is not None else point[:2] for point in points], dtype=float)
+        if reference_index is not None:
+            return np.hstack([values[:, :ncomp], coords[:, [2]], values[:, ncomp:ncomp + 1], coords[:, :2], values[:, ncomp + 1:]])
+        return np.hstack([values[:, :ncomp], coords, values[:, ncomp + 1:]])
+
+    def sweep_signature(self, T_vals, P_vals, n_vals, reference_index):
+        """
+        Identifies the sweep (data, grid and options) stored in a checkpoint.
+        """
+        return data_key('entropy', self.data, list(self.components), list(self.initial), list(T_vals), list(P_vals),
+                        n_vals if n_vals is None else list(n_vals), reference_index, self.inhibit_component, self.state_equation)
+
+    def run_entropy(self, decimals=None):
+        """
+        Runs the sweep and returns the results frame. The stored values keep full precision;
+        decimals only rounds the returned frame for display. After cancel(), only the solved points are returned.
+        """
+        self.cancelled = False
+        self.timed_out = False
+        self._deadline = None if self.sweep_time_limit is None else time.monotonic() + self.sweep_time_limit
+        self.run_timings = {}
         T_vals, P_vals, n_vals, reference_index = self.format_data()
-        results = pd.DataFrame(columns=self.components)
-
-        result_list = []
-
-        for T in T_vals:
-            for P in P_vals:
-                if reference_index is not None:
-                    for n in n_vals:
-                        initial_copy = self.initial.astype(float).copy()
-                        initial_copy[reference_index] = n
-                        result, Teq = gibbs.solve_entropy(initial_copy, T, P)
-
-                        result_dict = {comp: round(val, 3) for comp, val in zip(self.components, result)}
-                        result_dict[self.components[reference_index] + ' Initial'] = n
-                        result_dict['Equilibrium Temperature (K)'] = Teq
-                        result_dict.update({'Initial Temperature': T, 'Pressure': P})
-                        result_list.append(result_dict)
-                else:
-                    result, Teq = gibbs.solve_entropy(self.initial, T, P)
-                    result_dict = {comp: round(val, 3) for comp, val in zip(self.components, result)}
-                    result_dict.update({'Initial Temperature': T, 'Pressure': P})
-                    
-                    result_list.append(result_dict)
-
-        results = pd.concat([pd.DataFrame([result]) for result in result_list], ignore_index=True)
-
-        return results.round(3)
\ No newline at end of file
+        points = self.grid_points(T_vals, P_vals, n_vals if reference_index is not None else None)
+        columns = self.result_columns(reference_index)
+
+        if self.adaptive:
+            # A grade informada é a grade grossa; pontos são adicionados onde a composição varia mais que adaptive_tol
+            max_points = self.max_points or 4 * len(points)
+            values = lambda row: row[:len(self.components)]
+            points, solved = adaptive_sweep(self, points, reference_index, values, self.adaptive_tol, max_points,
+                                            progress=self.progress_callback, should_stop=self.should_stop)
+            rows = self.result_rows(points, solved, reference_index)
+            if self.output_path is not None:
+                with ResultsWriter(self.output_path, columns) as writer:
+                    for row in rows:
+                        writer.write(row)
+            return self.results_frame(rows, columns, decimals)
+
+        order = range(len(points))
+
+        # Buffer pré-alocado (mols e temperatura de equilíbrio): cada ponto escreve a sua linha, na ordem da grade
+        width = len(self.components) + 1 + len(self.extra_columns())
+        solved = np.full((len(points), width), np.nan)
+        done = np.zeros(len(points), dtype=bool)
+
+        checkpoint = None
+        if self.checkpoint_path is not None:
+            checkpoint = Checkpoint(self.checkpoint_path, self.sweep_signature(T_vals, P_vals, n_vals, reference_index), self.checkpoint_every)
+            self.recovered = checkpoint.load(solved, done) if self.resume else 0
+            self.remaining = len(points) - self.recovered
+            logger.info("Checkpoint: %d pontos recuperados, %d restantes.", self.recovered, self.remaining)
+
+        tasks = [(idx, points[idx] + (reference_index,)) for idx in order if not done[idx]]
+
+        # Com output_path, os resultados também são gravados em blocos no arquivo durante a varredura
+        writer = ResultsWriter(self.output_path, columns) if self.output_path is not None else None
+        if writer is not None:
+            for idx in np.flatnonzero(done):
+                writer.write(self.result_rows([points[idx]], solved[idx][None, :], reference_index)[0], idx)
+
+        completed = [int(done.sum())]
+        if self.progress_callback is not None:
+            self.progress_callback(completed[0], len(points))
+
+        def store(row, idx):
+            start = time.perf_counter()
+            solved[idx] = row
+            done[idx] = True
+            completed[0] += 1
+            if self.progress_callback is not None:
+                self.progress_callback(completed[0], len(points))
+            if writer is not None:
+                writer.write(self.result_rows([points[idx]], row[None, :], reference_index)[0], idx)
+            if checkpoint is not None:
+                checkpoint.update(solved, done)
+            store_time[0] += time.perf_counter() - start
+
+        store_time = [0.0]
+        start = time.perf_counter()
+        try:
+            solve_points(self, tasks, self.workers, callback=store, should_stop=self.should_stop)
+        finally:
+            # Os pontos concluídos são salvos mesmo quando a varredura é interrompida por um erro
+            if checkpoint is not None:
+                checkpoint.save(solved, done)
+            if writer is not None:
+                writer.close()
+
+        self.run_timings = {'sweep': time.perf_counter() - start, 'result handling': store_time[0]}
+
+        rows = self.result_rows(points, solved, reference_index)
+        if self.cancelled or self.timed_out:
+            rows = rows[done]
+        return self.results_frame(rows, columns, decimals)
+
+    def results_frame(self, rows, columns, decimals=None):
+        results = pd.DataFrame(rows, columns=columns)
+        if self.instrument:
+            log_instrumentation(results, self.run_timings)
+        if self.robust:
+            log_failures(results['Solve status'])
+        return results if decimals is None else results.round(decimals)
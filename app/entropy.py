@@ -1,10 +1,18 @@
+import logging
 import pyomo.environ as pyo
 import numpy as np
 from app.auxiliar_func.entropyAux import int_cp_T, enthalpy_T
-from app.auxiliar_func.get_solver import get_ipopt_solver
+from app.auxiliar_func.bounds import inhibited_index
+from app.auxiliar_func.property_cache import property_cache, data_key
+from app.auxiliar_func.get_solver import get_ipopt_solver, ipopt_iterations, SOLVER_BACKEND
+from app.auxiliar_func.point_cache import point_key
+from app.auxiliar_func.instrumentation import Instrumentation, instrument_solver, STATUS_CODES
+from app.auxiliar_func.retry import relax_bounds, set_retry_options, solve_with_retries, RELAXED_TOLERANCE
+
+logger = logging.getLogger(__name__)
 
 class Entropy:
-    def __init__(self, data, species, components, inhibited_component, equation='Ideal Gas'):
+    def __init__(self, data, species, components, inhibited_component, equation='Ideal Gas', point_cache=None, instrument=False):
         self.data = data
         self.species = species
         self.components = components
@@ -13,6 +21,11 @@ class Entropy:
         self.A = np.array([[component[specie] for specie in species] for component in data.values()])
         self.inhibited_component = inhibited_component
         self.equation = equation
+        self.data_key = data_key(data)
+        self.solver = None
+        self.point_cache = point_cache
+        self.instrumentation = Instrumentation(instrument)
+        self.last_solution = None
 
     def identify_phases(self, phase_type):
         """
@@ -28,14 +41,7 @@ class Entropy:
         epsilon = 1e-05
         bnds_aux = []
 
-        if self.inhibited_component and self.inhibited_component != '---':
-            try:
-                aux_idx = next(index for index, value in self.data.items() if value['Component'] == self.inhibited_component)
-            except StopIteration:
-                print(f"Inhibited component '{self.inhibited_component}' not found.")
-                aux_idx = None
-        else:
-            aux_idx = None
+        aux_idx = inhibited_index(self.data, self.inhibited_component)
 
         for i, comp in enumerate(self.data):
             if aux_idx is not None and i == aux_idx:
@@ -47,8 +53,74 @@ class Entropy:
 
         return tuple(bnds_aux)
     
-    def solve_entropy(self, initial, Tinit, P):
+    def solve_entropy(self, initial, Tinit, P, retry=(), time_limit=None):
+        """
+        Solves one point. retry holds the active rungs of the retry ladder (see solve_entropy_robust)
+        and time_limit the IPOPT time budget (s) of the attempt.
+        """
+        if not retry:
+            self.instrumentation.start_point()
+        key = None
+        if self.point_cache is not None:
+            key = point_key('entropy', self.data_key, None, self.equation, self.inhibited_component, {'backend': SOLVER_BACKEND}, initial, Tinit, P)
+            cached = None if retry else self.point_cache.get(key)
+            if cached is not None:
+                self.instrumentation.status = STATUS_CODES['cached']
+                return list(cached[:-1]), cached[-1]
+
+        with self.instrumentation.phase('build'):
+            model = self.build_model(initial, Tinit, P, relaxed='relaxed_bounds' in retry)
+        if 'warm_start' in retry and self.last_solution is not None:
+            # Starts from the last solved point (a grid neighbour in a sweep), clipped to the new bounds.
+            res, Teq = self.last_solution
+            for i in range(self.total_components):
+                model.n[i].set_value(min(max(res[i], model.n[i].lb), model.n[i].ub))
+            model.T.set_value(Teq)
+
+        # Solver
+        if self.solver is None:
+            self.solver = instrument_solver(get_ipopt_solver(), self.instrumentation)
+        set_retry_options(self.solver, retry, 1 / (8.314 * np.sum(initial)), time_limit)
+
+        results = self.solver.solve(model, tee=False)
+        self.instrumentation.iterations += ipopt_iterations(self.solver)
+
+        if results.solver.termination_condition == pyo.TerminationCondition.optimal:
+            with self.instrumentation.phase('results'):
+                res = [pyo.value(model.n[i]) for i in range(self.total_components)]
+                Teq = pyo.value(model.T)
+                # Relaxed-tolerance solutions are kept out of the cache (see Gibbs.solve_gibbs).
+                if key is not None and 'relaxed_bounds' not in retry:
+                    self.point_cache.put(key, res + [Teq])
+            self.last_solution = (res, Teq)
+            return res, Teq
+        else:
+            self.instrumentation.status = STATUS_CODES['failed']
+            raise Exception("Optimal solution not found.")
+
+    def solve_entropy_robust(self, initial, Tinit, P, time_limit=None):
+        """
+        solve_entropy that does not raise: a failed point is retried along RETRY_LADDER and, when every
+        rung fails or time_limit (s) runs out, returned as NaN. The status is left in instrumentation.status.
+        """
+        solve = lambda retry, time_left: self.solve_entropy(initial, Tinit, P, retry=retry, time_limit=time_left)
+        result, status = solve_with_retries(solve, time_limit)
+        if status != 'optimal':
+            self.instrumentation.status = STATUS_CODES[status]
+        if result is None:
+            return [np.nan] * self.total_components, np.nan
+        return result
+
+    def build_model(self, initial, Tinit, P, relaxed=False):
+        """
+        Builds the entropy maximization model of one point: mols and equilibrium temperature, with the
+        element and enthalpy balances to the feed at Tinit. relaxed widens the bounds and the balance
+        tolerances (retry ladder).
+        """
         bnds = self.bnds_values(initial)
+        if relaxed:
+            bnds = relax_bounds(bnds)
+        balance_tolerance = RELAXED_TOLERANCE if relaxed else 1e-6
         total_components = len(self.components)
 
         model = pyo.ConcreteModel()
@@ -82,29 +154,19 @@ class Entropy:
 
         model.element_balance = pyo.ConstraintList()
         for i in range(self.total_species):
-            tolerance = 1e-6
+            tolerance = balance_tolerance
             lhs = sum(self.A[j, i] * model.n[j] for j in range(total_components))
             rhs = sum(self.A[j, i] * initial[j] for j in range(total_components))
             model.element_balance.add(pyo.inequality(-tolerance, lhs - rhs, tolerance))
 
         enthalpy_exprs_final = enthalpy_T(model.T, self.data)
-        enthalpy_exprs_initial= enthalpy_T(Tinit, self.data)
+        enthalpy_exprs_initial = property_cache.get('enthalpy_T', Tinit, self.data_key, lambda: enthalpy_T(Tinit, self.data))
         initial_enthalpy_sum = sum(initial[j] * enthalpy_exprs_initial[j] for j in range(total_components))
         final_enthalpy_sum = sum(model.n[j] * enthalpy_exprs_final[j] for j in range(total_components))
 
-        tolerance = 1e-6
+        tolerance = balance_tolerance
         model.enthalpy_balance = pyo.Constraint(
             expr=pyo.inequality(-tolerance, final_enthalpy_sum - initial_enthalpy_sum, tolerance)
         )
 
-        # Solver
-        solver = get_ipopt_solver()
-
-        results = solver.solve(model, tee=False)
-
-        if results.solver.termination_condition == pyo.TerminationCondition.optimal:
-            res = [pyo.value(model.n[i]) for i in range(total_components)]
-            Teq = pyo.value(model.T)
-            return res, Teq
-        else:
-            raise Exception("Optimal solution not found.")
\ No newline at end of file
+        return model
\ No newline at end of file
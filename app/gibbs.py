@@ -1,11 +1,24 @@
+import logging
 import pyomo.environ as pyo
 import numpy as np
 from app.auxiliar_func.gibbsZero import gibbs_pad
-from app.auxiliar_func.eos import fug
-from app.auxiliar_func.get_solver import get_ipopt_solver
+from app.auxiliar_func.eos import EOS_PARAMS, R as R_EOS, cubic_parameters, cubic_three_roots, virial_matrix
+from app.auxiliar_func.property_cache import property_cache, data_key
+from app.auxiliar_func.get_solver import get_ipopt_solver, ipopt_iterations, InProcessIpopt, SOLVER_BACKEND
+from app.auxiliar_func.element_potential import rand_equilibrium
+from app.auxiliar_func.bounds import inhibited_index
+from app.auxiliar_func.point_cache import point_key
+from app.auxiliar_func.instrumentation import Instrumentation, instrument_solver, STATUS_CODES
+from app.auxiliar_func.retry import relax_bounds, set_retry_options, solve_with_retries, RELAXED_TOLERANCE
+
+logger = logging.getLogger(__name__)
 
 class Gibbs:
-    def __init__(self, data, species, components, inhibited_component,kij, equation='Ideal Gas'):
+    # IPOPT options of every solve; also part of the point cache key.
+    SOLVER_OPTIONS = {'tol': 1e-8, 'max_iter': 5000}
+
+    def __init__(self, data, species, components, inhibited_component,kij, equation='Ideal Gas', persistent=True, engine='ipopt',
+                 point_cache=None, instrument=False):
         self.data = data
         self.species = species
         self.components = components
@@ -15,6 +28,18 @@ class Gibbs:
         self.inhibited_component = inhibited_component
         self.equation = equation
         self.kij = kij
+        self.data_key = data_key(data)
+        self.persistent = persistent
+        self.engine = engine
+        self.point_cache = point_cache
+        self.kij_key = data_key(kij) if point_cache is not None else None
+        self.model = None
+        self.solver = None
+        self._last_T = None
+        self.last_iterations = 0
+        self.total_iterations = 0
+        self.instrumentation = Instrumentation(instrument)
+        self.last_solution = None
 
 
     def identify_phases(self, phase_type):
@@ -31,14 +56,7 @@ class Gibbs:
         epsilon = 1e-05
         bnds_aux = []
 
-        if self.inhibited_component and self.inhibited_component != '---':
-            try:
-                aux_idx = next(index for index, value in self.data.items() if value['Component'] == self.inhibited_component)
-            except StopIteration:
-                print(f"Inhibited component '{self.inhibited_component}' not found.")
-                aux_idx = None
-        else:
-            aux_idx = None
+        aux_idx = inhibited_index(self.data, self.inhibited_component)
 
         for i, comp in enumerate(self.data):
             if aux_idx is not None and i == aux_idx:
@@ -50,56 +68,388 @@ class Gibbs:
 
         return tuple(bnds_aux)
 
-    def solve_gibbs(self, initial, T, P, progress_callback=None):
-        initial[initial == 0] = 0.00001
-        bnds = self.bnds_values(initial)
+    def build_model(self):
+        """
+        Builds the Gibbs model once, with T, P, the feed vector, the bounds and the standard
+        chemical potentials as mutable Params. Between points only these numbers are updated.
+        """
         model = pyo.ConcreteModel()
-        model.n = pyo.Var(range(self.total_components), domain=pyo.NonNegativeReals, bounds=lambda m, i: bnds[i])
+        components = range(self.total_components)
+
+        model.T = pyo.Param(mutable=True, initialize=298.15)
+        model.P = pyo.Param(mutable=True, initialize=1.0)
+        model.n0 = pyo.Param(components, mutable=True, initialize=0.00001)
+        model.lb = pyo.Param(components, mutable=True, initialize=1e-8)
+        model.ub = pyo.Param(components, mutable=True, initialize=1.0)
+        model.mu0 = pyo.Param(components, mutable=True, initialize=0.0)
+        model.balance_tol = pyo.Param(mutable=True, initialize=1e-8)
+
+        model.n = pyo.Var(components, domain=pyo.NonNegativeReals, bounds=lambda m, i: (m.lb[i], m.ub[i]))
+
+        model.element_balance = pyo.ConstraintList()
+        for i in range(self.total_species):
+            lhs = sum(self.A[j, i] * model.n[j] for j in components)
+            rhs = sum(self.A[j, i] * model.n0[j] for j in components)
+            model.element_balance.add(pyo.inequality(-model.balance_tol, lhs - rhs, model.balance_tol))
+
+        # Primal and dual values of the last solve, sent back to IPOPT on a warm start.
+        model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT_EXPORT)
+        model.ipopt_zL_out = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+        model.ipopt_zU_out = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+        model.ipopt_zL_in = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+        model.ipopt_zU_in = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+
+        if self.equation != 'Ideal Gas' and self.identify_phases('g'):
+            self.build_eos(model)
+
+        model.obj = pyo.Objective(rule=self.gibbs_rule, sense=pyo.minimize)
 
+        return model
+
+    def gas_data(self):
+        gases = self.identify_phases('g')
+        names = list(self.data)
+        gas_components = {names[i]: self.data[names[i]] for i in gases}
+        gas_kij = self.kij.reindex(index=list(gas_components), columns=list(gas_components), fill_value=0)
+        return gases, gas_components, gas_kij
+
+    def build_eos(self, model):
+        """
+        Adds the real-gas equations to the model: the compressibility factor Z and ln(phi_i) of every
+        gas are variables tied to n by the EoS, so IPOPT sees exact derivatives of the fugacities.
+        For the cubic equations, Z is kept on the vapour (largest) root by requiring
+        f'(Z) >= 0 and f''(Z) >= 0 for f(Z) = Z^3 + c2*Z^2 + c1*Z + c0; the curvature constraint is
+        switched per point by update_root_selection.
+        """
+        gases, gas_components, gas_kij = self.gas_data()
+        model.gases = pyo.Set(initialize=gases)
+        model.Z = pyo.Var(initialize=1.0, bounds=(1e-6, None))
+        model.lnphi = pyo.Var(model.gases, initialize=0.0)
+
+        P_pa = model.P * 1e5
+        n_gas = sum(model.n[i] for i in gases)
+        y = {i: model.n[i] / n_gas for i in gases}
+
+        if self.equation == 'Virial':
+            model.B = pyo.Param(model.gases, model.gases, mutable=True, initialize=0.0)
+            B_mix = sum(y[i] * y[j] * model.B[i, j] for i in gases for j in gases)
+            model.eos_Z = pyo.Constraint(expr=model.Z == 1 + B_mix * P_pa / (R_EOS * model.T))
+            model.eos_lnphi = pyo.Constraint(model.gases, rule=lambda m, i: m.lnphi[i] == (
+                2 * sum(y[j] * m.B[i, j] for j in gases) - B_mix) * P_pa / (R_EOS * m.T))
+            return
+
+        params = EOS_PARAMS[self.equation]
+        _, b_i = cubic_parameters(298.15, self.equation, gas_components)
+        b = {i: b_i[k] for k, i in enumerate(gases)}
+        self._eos_b = b_i
+        model.a = pyo.Param(model.gases, model.gases, mutable=True, initialize=0.0)
+
+        a_mix = sum(y[i] * y[j] * model.a[i, j] for i in gases for j in gases)
+        b_mix = sum(y[i] * b[i] for i in gases)
+        A = a_mix * P_pa / (R_EOS**2 * model.T**2)
+        B = b_mix * P_pa / (R_EOS * model.T)
+
+        _, c2, c1, c0 = params['Z_coeffs'](A, B)
+        model.eos_Z = pyo.Constraint(expr=model.Z**3 + c2 * model.Z**2 + c1 * model.Z + c0 == 0)
+        model.eos_root_slope = pyo.Constraint(expr=3 * model.Z**2 + 2 * c2 * model.Z + c1 >= 0)
+        model.eos_root_curvature = pyo.Constraint(expr=6 * model.Z + 2 * c2 >= 0)
+        model.eos_covolume = pyo.Constraint(expr=model.Z - B >= 1e-8)
+
+        ln_phi_term = params['ln_phi_term'](model.Z, B, log=pyo.log)
+        model.eos_lnphi = pyo.Constraint(model.gases, rule=lambda m, i: m.lnphi[i] == (
+            b[i] / b_mix * (m.Z - 1) - pyo.log(m.Z - B)
+            - (A / B) * (2 * sum(y[j] * m.a[i, j] for j in gases) / a_mix - b[i] / b_mix) * ln_phi_term))
+
+    def update_eos(self, model, T):
+        """
+        Loads the temperature-dependent EoS parameters (a_ij or B_ij) into the model.
+        """
+        gases, gas_components, gas_kij = self.gas_data()
+        if self.equation == 'Virial':
+            B_matrix = virial_matrix(T, gas_components, gas_kij)
+            for k, i in enumerate(gases):
+                for l, j in enumerate(gases):
+                    model.B[i, j] = B_matrix[k, l]
+        else:
+            a_i, _ = cubic_parameters(T, self.equation, gas_components)
+            a_ij = (1 - gas_kij.values) * np.sqrt(np.outer(a_i, a_i))
+            self._eos_a = a_ij
+            for k, i in enumerate(gases):
+                for l, j in enumerate(gases):
+                    model.a[i, j] = a_ij[k, l]
+
+    def gibbs_rule(self, model):
+        R = 8.314  # J/mol·K
         solids = self.identify_phases('s')
         gases = self.identify_phases('g')
 
-        def gibbs_rule(model):
-            R = 8.314  # J/mol·K
-            df_pad = gibbs_pad(T, self.data)
-            phii = fug(T=T, P=P, eq=self.equation, n=model.n, components=self.data, kij_df=self.kij)
+        if model.component('lnphi') is not None:
+            lnphi = model.lnphi
+        else:
+            lnphi = {i: 0.0 for i in gases}
 
-            if isinstance(phii, (int, float)):  
-                phii = [phii] * self.total_components
+        n_sum = sum(model.n[j] for j in range(self.total_components))
+        mi_gas = [
+            model.mu0[i] + R * model.T * (
+                lnphi[i] +
+                pyo.log(model.n[i] / n_sum) +
+                pyo.log(model.P)
+            ) for i in gases
+        ]
 
-            mi_gas = [
-                df_pad[i] + R * T * (
-                    pyo.log(phii[i]) + 
-                    pyo.log(model.n[i] / sum(model.n[j] for j in range(self.total_components))) + 
-                    pyo.log(P)
-                ) for i in gases
-            ]
+        mi_solids = [model.mu0[i] for i in solids]
 
-            mi_solids = [df_pad[i] for i in solids]
+        regularization_term = 1e-6
+        total_gibbs = sum(mi_gas[i] * model.n[gases[i]] for i in range(len(mi_gas))) + \
+                    sum(mi_solids[i] * model.n[solids[i]] for i in range(len(mi_solids))) + \
+                    regularization_term
 
-            regularization_term = 1e-6
-            total_gibbs = sum(mi_gas[i] * model.n[gases[i]] for i in range(len(mi_gas))) + \
-                        sum(mi_solids[i] * model.n[solids[i]] for i in range(len(mi_solids))) + \
-                        regularization_term
-            
-            return total_gibbs
+        return total_gibbs
 
-        model.obj = pyo.Objective(rule=gibbs_rule, sense=pyo.minimize)
-        model.element_balance = pyo.ConstraintList()
-        for i in range(self.total_species):
-            tolerance = 1e-8
-            lhs = sum(self.A[j, i] * model.n[j] for j in range(self.total_components))
-            rhs = sum(self.A[j, i] * initial[j] for j in range(self.total_components))
-            model.element_balance.add(pyo.inequality(-tolerance, lhs - rhs, tolerance))
+    def update_model(self, initial, T, P, warm_start=False, relaxed=False):
+        """
+        Loads the numbers of a new (T, P, n) point into the persistent model.
+        With warm_start the previous solution is kept (clipped to the new bounds) as the initial point;
+        relaxed widens the bounds and the element balance tolerance (retry ladder).
+        """
+        if self.model is None or not self.persistent:
+            with self.instrumentation.phase('build'):
+                self.model = self.build_model()
+            self._last_T = None
+        model = self.model
+
+        bnds = self.bnds_values(initial)
+        if relaxed:
+            bnds = relax_bounds(bnds)
+        model.balance_tol = RELAXED_TOLERANCE if relaxed else 1e-8
+        model.T = T
+        model.P = P
+        for i in range(self.total_components):
+            model.n0[i] = initial[i]
+            model.lb[i], model.ub[i] = bnds[i]
+            if warm_start and model.n[i].value is not None:
+                model.n[i].set_value(min(max(model.n[i].value, bnds[i][0]), bnds[i][1]))
+            else:
+                model.n[i].set_value(None)
+        if not warm_start:
+            self.reset_eos(model)
+
+        if self._last_T != T:
+            with self.instrumentation.phase('gibbs_pad'):
+                df_pad = property_cache.get('gibbs_pad', T, self.data_key, lambda: gibbs_pad(T, self.data))
+                for i in range(self.total_components):
+                    model.mu0[i] = df_pad[i]
+            if model.component('lnphi') is not None:
+                with self.instrumentation.phase('eos'):
+                    self.update_eos(model, T)
+            self._last_T = T
+
+        if model.component('eos_root_curvature') is not None:
+            start = [model.n[i].value for i in range(self.total_components)] if warm_start else initial
+            self.update_root_selection(model, start, T, P)
+
+        return model
+
+    def update_root_selection(self, model, n, T, P):
+        """
+        Keeps f''(Z) >= 0 only when the cubic has three real roots at composition n. It then excludes
+        the liquid-like roots, but with a single real root below the inflection point (compressed
+        liquid) it would make the model infeasible. Returns True when the constraint was switched.
+        """
+        three_roots = self.three_real_roots(model, n, T, P)
+        if three_roots == model.eos_root_curvature.active:
+            return False
+        if three_roots:
+            model.eos_root_curvature.activate()
+        else:
+            model.eos_root_curvature.deactivate()
+        return True
+
+    def three_real_roots(self, model, n, T, P):
+        gases = list(model.gases)
+        y = np.array([n[i] for i in gases], dtype=float)
+        y /= y.sum()
+        P_pa = P * 1e5
+        A = y @ self._eos_a @ y * P_pa / (R_EOS**2 * T**2)
+        B = y @ self._eos_b * P_pa / (R_EOS * T)
+        _, c2, c1, c0 = EOS_PARAMS[self.equation]['Z_coeffs'](A, B)
+        return bool(cubic_three_roots(c2, c1, c0))
+
+    def check_root_selection(self, model, T, P):
+        """
+        The curvature constraint is chosen at the starting composition, but the solution may lie on the
+        other side of the three-root region. When the choice differs at the solution, the point is
+        solved once more from it with the constraint switched; if that solve fails, the first solution is kept.
+        """
+        if model.component('eos_root_curvature') is None:
+            return
+        variables = [model.n[i] for i in range(self.total_components)] + [model.Z] + [model.lnphi[i] for i in model.gases]
+        solution = [variable.value for variable in variables]
+        was_active = model.eos_root_curvature.active
+        if not self.update_root_selection(model, solution[:self.total_components], T, P):
+            return
+        if not self.run_solver(model, False):
+            logger.debug("Nova solução com a restrição de curvatura alternada falhou; mantida a primeira solução.")
+            for variable, value in zip(variables, solution):
+                variable.set_value(value)
+            if was_active:
+                model.eos_root_curvature.activate()
+            else:
+                model.eos_root_curvature.deactivate()
+
+    def reset_eos(self, model):
+        """
+        Starts the real-gas variables from the ideal-gas state (Z = 1, phi = 1), inside the vapour-root region.
+        """
+        if model.component('lnphi') is not None:
+            model.Z.set_value(1.0)
+            for i in model.gases:
+                model.lnphi[i].set_value(0.0)
+
+    def warm_start_options(self, solver, model, enabled):
+        """
+        Switches IPOPT's warm start on or off, feeding back the bound multipliers of the last solve.
+        Pyomo's cyipopt interface neither reads nor writes the multiplier suffixes, so with the
+        in-process backend only the primal point (the values left in the model) is reused.
+        """
+        if enabled and not isinstance(solver, InProcessIpopt):
+            model.ipopt_zL_in.update(model.ipopt_zL_out)
+            model.ipopt_zU_in.update(model.ipopt_zU_out)
+            solver.options['warm_start_init_point'] = 'yes'
+            solver.options['warm_start_bound_push'] = 1e-9
+            solver.options['warm_start_mult_bound_push'] = 1e-9
+            solver.options['mu_init'] = 1e-6
+        else:
+            model.dual.clear()
+            model.ipopt_zL_in.clear()
+            model.ipopt_zU_in.clear()
+            for option in ('warm_start_init_point', 'warm_start_bound_push', 'warm_start_mult_bound_push', 'mu_init'):
+                solver.options.pop(option, None)
+
+    def run_solver(self, model, warm_start):
+        solver = self.solver
+        self.warm_start_options(solver, model, warm_start)
+        try:
+            results = solver.solve(model, tee=False)
+        except (ValueError, RuntimeError):
+            return False
+        self.last_iterations += ipopt_iterations(solver)
+        return results.solver.termination_condition == pyo.TerminationCondition.optimal
+
+    def solve_rand(self, initials, T, P):
+        """
+        Solves ideal-gas equilibria for one or many feed vectors at (T, P) with the NumPy
+        element-potential engine. Returns the mols (N x ncomp) and a mask of converged rows.
+        """
+        R = 8.314  # J/mol·K
+        with self.instrumentation.phase('gibbs_pad'):
+            g = property_cache.get('gibbs_pad', T, self.data_key, lambda: gibbs_pad(T, self.data)) / (R * T)
+        phases = [self.data[comp].get("Phase") for comp in self.data]
+        excluded = np.zeros(self.total_components, dtype=bool)
+        aux_idx = inhibited_index(self.data, self.inhibited_component)
+        if aux_idx is not None:
+            excluded[aux_idx] = True
+        with self.instrumentation.phase('solver'):
+            n, converged, iterations = rand_equilibrium(g, self.A, initials, P, phases, excluded)
+        self.instrumentation.iterations += iterations
+        return n, converged
+
+    def solve_gibbs_batch(self, initials, T, P):
+        """
+        Solves many feed vectors at the same (T, P). With engine='rand' on ideal gases all feeds go
+        through one vectorized element-potential solve, and only rows that fail are passed to IPOPT.
+        """
+        initials = np.atleast_2d(np.array(initials, dtype=float))
+        initials[initials == 0] = 0.00001
+        if self.engine == 'rand' and self.equation == 'Ideal Gas':
+            n, converged = self.solve_rand(initials, T, P)
+        else:
+            n, converged = np.zeros_like(initials), np.zeros(len(initials), dtype=bool)
+        for row in np.flatnonzero(~converged):
+            n[row] = self.solve_ipopt(initials[row], T, P)
+        return n
+
+    def solve_gibbs(self, initial, T, P, progress_callback=None, warm_start=False, retry=(), time_limit=None):
+        """
+        Solves one point. retry holds the active rungs of the retry ladder (see solve_gibbs_robust)
+        and time_limit the IPOPT time budget (s) of the attempt.
+        """
+        initial[initial == 0] = 0.00001
+        if not retry:
+            self.instrumentation.start_point()
+        key = None
+        if self.point_cache is not None:
+            options = dict(self.SOLVER_OPTIONS, engine=self.engine, backend=SOLVER_BACKEND)
+            key = point_key('gibbs', self.data_key, self.kij_key, self.equation, self.inhibited_component, options, initial, T, P)
+            cached = None if retry else self.point_cache.get(key)
+            if cached is not None:
+                self.instrumentation.status = STATUS_CODES['cached']
+                return list(cached)
+
+        result = None
+        if self.engine == 'rand' and self.equation == 'Ideal Gas' and not retry:
+            n, converged = self.solve_rand(initial, T, P)
+            if converged[0]:
+                result = list(n[0])
+        if result is None:
+            result = self.solve_ipopt(initial, T, P, warm_start, retry, time_limit)
+        self.last_solution = result
+
+        # Points solved with the relaxed balance tolerance are not cached: a later hit would pass them
+        # off as a regular solve.
+        if key is not None and 'relaxed_bounds' not in retry:
+            with self.instrumentation.phase('results'):
+                self.point_cache.put(key, result)
+        return result
+
+    def solve_gibbs_robust(self, initial, T, P, warm_start=False, time_limit=None):
+        """
+        solve_gibbs that does not raise: a failed point is retried along RETRY_LADDER and, when every
+        rung fails or time_limit (s) runs out, returned as NaN. The status is left in instrumentation.status.
+        """
+        solve = lambda retry, time_left: self.solve_gibbs(initial, T, P, warm_start=warm_start, retry=retry, time_limit=time_left)
+        result, status = solve_with_retries(solve, time_limit)
+        if status != 'optimal':
+            self.instrumentation.status = STATUS_CODES[status]
+        if result is None:
+            return [np.nan] * self.total_components
+        return result
+
+    def solve_ipopt(self, initial, T, P, warm_start=False, retry=(), time_limit=None):
+        warm_start = warm_start and self.persistent and self.model is not None and self.model.n[0].value is not None
+        model = self.update_model(initial, T, P, warm_start, relaxed='relaxed_bounds' in retry)
+        if 'warm_start' in retry and self.last_solution is not None:
+            # Starts from the last solved point (a grid neighbour in a sweep), clipped to the new bounds.
+            for i in range(self.total_components):
+                model.n[i].set_value(min(max(self.last_solution[i], model.lb[i].value), model.ub[i].value))
+            self.reset_eos(model)
 
         # Solver
-        solver = get_ipopt_solver()
+        if self.solver is None:
+            self.solver = instrument_solver(get_ipopt_solver(), self.instrumentation)
+
+        self.solver.options.update(self.SOLVER_OPTIONS)
+        set_retry_options(self.solver, retry, 1 / (8.314 * T * np.sum(initial)), time_limit)
 
-        solver.options['tol'] = 1e-8
-        solver.options['max_iter'] = 5000
-        results = solver.solve(model, tee=False)
+        self.last_iterations = 0
+        optimal = self.run_solver(model, warm_start)
+        if not optimal and warm_start:
+            # Falls back to a cold start from the bounds alone.
+            for i in range(self.total_components):
+                model.n[i].set_value(None)
+            self.reset_eos(model)
+            optimal = self.run_solver(model, False)
+        if optimal:
+            self.check_root_selection(model, T, P)
+        self.total_iterations += self.last_iterations
+        self.instrumentation.iterations += self.last_iterations
 
-        if results.solver.termination_condition == pyo.TerminationCondition.optimal:
-            return [pyo.value(model.n[i]) for i in range(self.total_components)]
+        if optimal:
+            with self.instrumentation.phase('results'):
+                return [pyo.value(model.n[i]) for i in range(self.total_components)]
         else:
-            raise Exception("Optimal solution not found.")
\ No newline at end of file
+            self.instrumentation.status = STATUS_CODES['failed']
+            for i in range(self.total_components):
+                model.n[i].set_value(None)
+            self.reset_eos(model)
+            raise Exception("Optimal solution not found.")
@@ -1,4 +1,17 @@
-from app.graphs.surface import plot_superficie
-from app.graphs.linear import linear_graph
-from app.graphs.correlation import plot_correlation_matrix
-from app.graphs.linearmaxS import linear_graph_maxs
\ No newline at end of file
+# The plotting modules import matplotlib/seaborn, so they are only loaded when a plot function is first used.
+_exports = {
+    'plot_superficie': 'app.graphs.surface',
+    'linear_graph': 'app.graphs.linear',
+    'plot_correlation_matrix': 'app.graphs.correlation',
+    'linear_graph_maxs': 'app.graphs.linearmaxS',
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(_exports[name]), name)
+
+
+__all__ = list(_exports)
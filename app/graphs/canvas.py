@@ -0,0 +1,81 @@
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg, NavigationToolbar2QT
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import Qt
+
+
+class PlotWindow(QWidget):
+    """
+    Window with one persistent FigureCanvasQTAgg, reused by every plot of a screen.
+
+    Plot functions call prepare(layout) with a key describing the axes and artists they need: when the
+    key changes the figure is cleared and they build the layout again (prepare returns True); otherwise
+    they only update the data of the artists kept in self.artists. Closing the window clears the figure.
+    """
+    def __init__(self, title="TeS", parent=None, size=(1100, 480)):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle(title)
+        self.resize(*size)
+
+        self.figure = Figure(figsize=(10, 4))
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+        self.layout_key = None
+        self.artists = {}
+        self._rebuilt = False
+
+    def prepare(self, layout_key):
+        if layout_key == self.layout_key:
+            return False
+        self.figure.clear()
+        self.layout_key = layout_key
+        self.artists = {}
+        self._rebuilt = True
+        return True
+
+    def draw(self):
+        if self._rebuilt:
+            self.figure.tight_layout()
+            self._rebuilt = False
+        # draw_idle agrupa os redesenhos pedidos antes de o Qt voltar ao loop de eventos
+        self.canvas.draw_idle()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def release(self):
+        """
+        Drops the artists and the figure contents; the next plot builds its layout again.
+        """
+        self.figure.clear()
+        self.layout_key = None
+        self.artists = {}
+
+    def closeEvent(self, event):
+        self.release()
+        super().closeEvent(event)
+
+
+class PyplotFigure:
+    """
+    Same interface as PlotWindow over a new pyplot figure, shown with plt.show() and closed after it,
+    for plot functions called without a canvas (e.g. from scripts).
+    """
+    def __init__(self, figsize):
+        self.figure = plt.figure(figsize=figsize)
+        self.artists = {}
+
+    def prepare(self, layout_key):
+        return True
+
+    def draw(self):
+        self.figure.tight_layout()
+        plt.show()
+        plt.close(self.figure)
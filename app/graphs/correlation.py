@@ -1,17 +1,35 @@
+import numpy as np
 import seaborn as sns
-import matplotlib.pyplot as plt
+from seaborn.utils import relative_luminance
+from app.graphs.canvas import PyplotFigure
 
-def plot_correlation_matrix(df):
+def plot_correlation_matrix(df, canvas=None):
+    """
+    Spearman and Pearson correlation heatmaps, drawn into canvas (a PlotWindow) or, without it, a pyplot figure.
+    """
     df = df.loc[:, (df != df.iloc[0]).any()]
     df = df.loc[:, df.mean().abs() > 1e-4]
     spearman_corr = df.corr(method='spearman')
     pearson_corr = df.corr(method='pearson')
 
-    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(15, 6))
-    sns.heatmap(spearman_corr, ax=axes[0], cmap='coolwarm', annot=True, fmt=".2f", vmin=-1, vmax=1)
-    sns.heatmap(pearson_corr, ax=axes[1], cmap='coolwarm', annot=True, fmt=".2f", vmin=-1, vmax=1)
-    axes[0].set_title('Spearman Correlation')
-    axes[1].set_title('Pearson Correlation')
+    canvas = canvas or PyplotFigure(figsize=(15, 6))
+    # As anotações do seaborn só existem nas células válidas, por isso as células NaN fazem parte do layout
+    layout = ('correlation', tuple(df.columns), spearman_corr.isna().to_numpy().tobytes(), pearson_corr.isna().to_numpy().tobytes())
+    if canvas.prepare(layout):
+        axes = canvas.figure.subplots(nrows=1, ncols=2)
+        sns.heatmap(spearman_corr, ax=axes[0], cmap='coolwarm', annot=True, fmt=".2f", vmin=-1, vmax=1)
+        sns.heatmap(pearson_corr, ax=axes[1], cmap='coolwarm', annot=True, fmt=".2f", vmin=-1, vmax=1)
+        axes[0].set_title('Spearman Correlation')
+        axes[1].set_title('Pearson Correlation')
+        canvas.artists['axes'] = axes
+    else:
+        # Mesmas variáveis: só os valores das células e das anotações são atualizados
+        for ax, corr in zip(canvas.artists['axes'], (spearman_corr, pearson_corr)):
+            mesh = ax.collections[0]
+            values = np.ma.masked_invalid(corr.to_numpy())
+            mesh.set_array(values)
+            for text, value in zip(ax.texts, values.compressed()):
+                text.set_text(f"{value:.2f}")
+                text.set_color(".15" if relative_luminance(mesh.cmap(mesh.norm(value))) > .408 else "w")
 
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    canvas.draw()
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def select_points(dataframe, label1, label2, value1, value2, x_label, index=None):
+    """
+    Rows of the composition plot (label1 == value1 and label2 == value2) sorted by x_label, looked up
+    in index (a ResultsIndex over dataframe) when given, otherwise filtered with boolean masks.
+    """
+    if index is not None:
+        return index.slice(label1, value1, label2, value2, x_label)
+    filtered_data = dataframe[(dataframe[label1] == value1) & (dataframe[label2] == value2)]
+    return filtered_data.sort_values(x_label, kind='stable')
+
+
+def pixel_width(ax):
+    """
+    Width of the axes on the canvas, in pixels.
+    """
+    return max(int(ax.bbox.width), 1)
+
+
+def minmax_indices(x, y, n_buckets):
+    """
+    Indices of the points kept to draw y(x) over n_buckets pixel columns: the first and last points
+    and, in each column, the points with the smallest and largest y (NaN ignored) plus the first NaN
+    point, so failed points still break the line. The drawn line keeps the envelope of the full series.
+    x must be sorted; series with at most 2 * n_buckets points are kept whole.
+    """
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) * (n_buckets / span)).astype(np.int64), n_buckets - 1)
+    else:
+        bucket = np.arange(n) * n_buckets // n
+    # Mínimo e máximo de cada coluna ignorando NaN; um ponto NaN por coluna mantém as falhas visíveis
+    nan = np.isnan(y)
+    order_min = np.lexsort((np.where(nan, np.inf, y), bucket))
+    order_max = np.lexsort((np.where(nan, -np.inf, y), bucket))
+    starts = np.flatnonzero(np.r_[True, np.diff(bucket[order_min]) != 0])
+    ends = np.r_[starts[1:], n] - 1
+    nan_rows = np.flatnonzero(nan)
+    first_nan = nan_rows[np.unique(bucket[nan_rows], return_index=True)[1]]
+    return np.unique(np.concatenate((order_min[starts], order_max[ends], first_nan, [0, n - 1])))
+
+
+def downsampled(x, y, ax):
+    """
+    x and y reduced to what fits the pixel width of ax (see minmax_indices).
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    keep = minmax_indices(x, y, pixel_width(ax))
+    return x[keep], y[keep]
@@ -1,9 +1,14 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from app.graphs.canvas import PyplotFigure
+from app.graphs.downsample import downsampled, select_points
 
-def linear_graph(dataframe, label1, label2, value1, value2, components, selected_components, name_colum, graph_type):
-    filtered_data = dataframe[(dataframe[label1] == value1) & (dataframe[label2] == value2)]
+def linear_graph(dataframe, label1, label2, value1, value2, components, selected_components, name_colum, graph_type, canvas=None, index=None):
+    """
+    Composition against T, P or the reference component, drawn into canvas (a PlotWindow) or, without it, a pyplot figure.
+    index (a ResultsIndex over dataframe) speeds up the lookup of the points; every line is downsampled
+    to the pixel width of its axes.
+    """
 
     colors_list = [
     'lightseagreen',  # Red (Primary)
@@ -32,64 +37,44 @@ def linear_graph(dataframe, label1, label2, value1, value2, components, selected
     '#FF7043'   # Deep Orange
 ]
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    x_label = {'N': name_colum, 'T': 'Temperature', 'P': 'Pressure'}[graph_type]
+    filtered_data = select_points(dataframe, label1, label2, value1, value2, x_label, index)
+    x = filtered_data[x_label]
+    plotted = [(idx, component) for idx, component in enumerate(components) if component in filtered_data.columns]
 
-    if graph_type == "N":
-        x = filtered_data[name_colum]
-        for idx, component in enumerate(components):
-            if component in filtered_data.columns:
-                y = filtered_data[component]
-                ax1.plot(x, y, label=component, color=colors_list[idx % len(colors_list)])  # Use color from the list
-        ax1.set_xlabel(name_colum)
-        ax1.set_ylabel('Mols')
-        ax1.grid(True)
+    if selected_components:
+        selected_data = filtered_data[selected_components]
+        total_sum = selected_data.sum(axis=1)
+        normalized_data = selected_data.div(total_sum, axis=0)
+        fractions = [(idx, component) for idx, component in enumerate(selected_components) if component in normalized_data.columns]
+    else:
+        fractions = []
 
-    elif graph_type == "T":
-        x = filtered_data['Temperature']
-        for idx, component in enumerate(components):
-            if component in filtered_data.columns:
-                y = filtered_data[component]
-                ax1.plot(x, y, label=component, color=colors_list[idx % len(colors_list)])  # Use color from the list
-        ax1.set_xlabel('Temperature')
+    canvas = canvas or PyplotFigure(figsize=(15, 6))
+    # Os eixos e as linhas só são recriados quando o tipo de gráfico ou os componentes mudam
+    if canvas.prepare(('linear', x_label, tuple(plotted), tuple(fractions))):
+        ax1, ax2 = canvas.figure.subplots(1, 2)
+        lines = [ax1.plot([], [], label=component, color=colors_list[idx % len(colors_list)])[0] for idx, component in plotted]
+        ax1.set_xlabel(x_label)
         ax1.set_ylabel('Mols')
         ax1.grid(True)
+        ax1.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize='small')
 
-    elif graph_type == "P":
-        x = filtered_data['Pressure']
-        for idx, component in enumerate(components):
-            if component in filtered_data.columns:
-                y = filtered_data[component]
-                ax1.plot(x, y, label=component, color=colors_list[idx % len(colors_list)])  # Use color from the list
-        ax1.set_xlabel('Pressure')
-        ax1.set_ylabel('Mols')
-        ax1.grid(True)
-    
-    ax1.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize='small')
+        fraction_lines = [ax2.plot([], [], label=f"{component}", color=colors_list[idx % len(colors_list)])[0] for idx, component in fractions]
+        if fractions:
+            ax2.set_xlabel(x_label)
+            ax2.set_ylabel('Molar Fraction')
+            ax2.grid(True)
+            ax2.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize='small')
+        canvas.artists.update(axes=(ax1, ax2), lines=lines, fraction_lines=fraction_lines)
 
-    if selected_components:
-        if graph_type == "N":
-            label = name_colum
-            x = filtered_data[label]
-        elif graph_type == "T":
-            label = 'Temperature'
-            x = filtered_data[label]
-        elif graph_type == "P":
-            label = 'Pressure'
-            x = filtered_data[label]
+    artists = canvas.artists
+    for line, (idx, component) in zip(artists['lines'], plotted):
+        line.set_data(*downsampled(x, filtered_data[component], line.axes))
+    for line, (idx, component) in zip(artists['fraction_lines'], fractions):
+        line.set_data(*downsampled(x, normalized_data[component], line.axes))
+    for ax in artists['axes']:
+        ax.relim()
+        ax.autoscale_view()
 
-        selected_data = filtered_data[selected_components]
-        total_sum = selected_data.sum(axis=1)
-        normalized_data = selected_data.div(total_sum, axis=0)
-        
-        for idx, component in enumerate(selected_components):
-            if component in normalized_data.columns:
-                y = normalized_data[component]
-                ax2.plot(x, y, label=f"{component}", color=colors_list[idx % len(colors_list)])  # Use color from the list
-        
-        ax2.set_xlabel(label)
-        ax2.set_ylabel('Molar Fraction')
-        ax2.grid(True)
-        ax2.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize='small')
-    
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    canvas.draw()
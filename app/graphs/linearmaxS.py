@@ -1,9 +1,15 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from app.graphs.canvas import PyplotFigure
+from app.graphs.downsample import downsampled, select_points
 
-def linear_graph_maxs(dataframe, label1, label2, value1, value2, components, selected_components, name_colum, graph_type):
-    filtered_data = dataframe[(dataframe[label1] == value1) & (dataframe[label2] == value2)]
+def linear_graph_maxs(dataframe, label1, label2, value1, value2, components, selected_components, name_colum, graph_type, canvas=None, index=None):
+    """
+    Composition (and equilibrium temperature) against T, P or the reference component, drawn into canvas
+    (a PlotWindow) or, without it, a pyplot figure.
+    index (a ResultsIndex over dataframe) speeds up the lookup of the points; every line is downsampled
+    to the pixel width of its axes.
+    """
 
     colors_list = ['red',
                     'green',
@@ -15,65 +21,68 @@ def linear_graph_maxs(dataframe, label1, label2, value1, value2, components, sel
     
     line_styles = ['-', '--', ':']
 
-    fig1, ax1 = plt.subplots(figsize=(8, 4))
-
     if graph_type == "N":
-        x = filtered_data[name_colum]
         x_label = name_colum
     elif graph_type == "T":
-        x = filtered_data['Initial Temperature']
         x_label = 'Initial Temperature'
     elif graph_type == "P":
-        x = filtered_data['Pressure']
         x_label = 'Pressure'
+    filtered_data = select_points(dataframe, label1, label2, value1, value2, x_label, index)
+    x = filtered_data[x_label]
 
-    for idx, component in enumerate(components):
-        if component in filtered_data.columns:
-            y = filtered_data[component]
-            color = colors_list[idx % len(colors_list)]
-            line_style = line_styles[(idx // len(colors_list)) % len(line_styles)]
-            ax1.plot(x, y, label=component, color=color, linestyle=line_style)
-
-    ax1.set_xlabel(x_label)
-    ax1.set_ylabel('Mols')
-    ax1.grid(True)
-    ax1.legend(loc='upper left', bbox_to_anchor=(1.2, 1), fontsize='small')
-
-    if 'Equilibrium Temperature (K)' in filtered_data.columns:
-        ax1_twin = ax1.twinx()
-        eq_temp = filtered_data['Equilibrium Temperature (K)']
-        ax1_twin.plot(x, eq_temp, label='Equilibrium Temperature (K)', color='black', linestyle='--')
-        ax1_twin.set_ylabel('Equilibrium Temperature (K)', color='black')
-        ax1_twin.tick_params(axis='y', labelcolor='black')
-
-    plt.tight_layout()
-    plt.show()
-
+    plotted = [(idx, component) for idx, component in enumerate(components) if component in filtered_data.columns]
     if len(selected_components) > 0:
-        fig2, ax2 = plt.subplots(figsize=(8, 4))
-        
         selected_data = filtered_data[selected_components]
         total_sum = selected_data.sum(axis=1)
         normalized_data = selected_data.div(total_sum, axis=0)
+        fractions = [(idx, component) for idx, component in enumerate(selected_components) if component in normalized_data.columns]
+    else:
+        fractions = []
+    has_teq = 'Equilibrium Temperature (K)' in filtered_data.columns
+
+    def style(idx):
+        return dict(color=colors_list[idx % len(colors_list)], linestyle=line_styles[(idx // len(colors_list)) % len(line_styles)])
+
+    def add_teq_axis(ax):
+        twin = ax.twinx()
+        line = twin.plot([], [], label='Equilibrium Temperature (K)', color='black', linestyle='--')[0]
+        twin.set_ylabel('Equilibrium Temperature (K)', color='black')
+        twin.tick_params(axis='y', labelcolor='black')
+        return twin, line
+
+    # Mols e frações molares ficam em uma única figura (um painel abaixo do outro), reaproveitada entre os cliques
+    canvas = canvas or PyplotFigure(figsize=(8, 8 if len(selected_components) > 0 else 4))
+    if canvas.prepare(('linear_maxs', x_label, tuple(plotted), tuple(fractions), len(selected_components) > 0, has_teq)):
+        axes = canvas.figure.subplots(2 if len(selected_components) > 0 else 1, 1, squeeze=False)[:, 0]
+        ax1 = axes[0]
+        lines = [ax1.plot([], [], label=component, **style(idx))[0] for idx, component in plotted]
+        ax1.set_xlabel(x_label)
+        ax1.set_ylabel('Mols')
+        ax1.grid(True)
+        ax1.legend(loc='upper left', bbox_to_anchor=(1.2, 1), fontsize='small')
 
-        for idx, component in enumerate(selected_components):
-            if component in normalized_data.columns:
-                y = normalized_data[component]
-                color = colors_list[idx % len(colors_list)]
-                line_style = line_styles[(idx // len(colors_list)) % len(line_styles)]
-                ax2.plot(x, y, label=f"{component}", color=color, linestyle=line_style)
+        fraction_lines = []
+        if len(axes) > 1:
+            ax2 = axes[1]
+            fraction_lines = [ax2.plot([], [], label=f"{component}", **style(idx))[0] for idx, component in fractions]
+            ax2.set_xlabel(x_label)
+            ax2.set_ylabel('Molar Fraction')
+            ax2.grid(True)
+            ax2.legend(loc='upper left', bbox_to_anchor=(1.2, 1), fontsize='small')
 
-        ax2.set_xlabel(x_label)
-        ax2.set_ylabel('Molar Fraction')
-        ax2.grid(True)
-        ax2.legend(loc='upper left', bbox_to_anchor=(1.2, 1), fontsize='small')
+        twins = [add_teq_axis(ax) for ax in axes] if has_teq else []
+        canvas.artists.update(axes=list(axes) + [twin for twin, _ in twins], lines=lines, fraction_lines=fraction_lines,
+                              teq_lines=[line for _, line in twins])
 
-        if 'Equilibrium Temperature (K)' in filtered_data.columns:
-            ax2_twin = ax2.twinx()
-            eq_temp = filtered_data['Equilibrium Temperature (K)']
-            ax2_twin.plot(x, eq_temp, label='Equilibrium Temperature (K)', color='black', linestyle='--')
-            ax2_twin.set_ylabel('Equilibrium Temperature (K)', color='black')
-            ax2_twin.tick_params(axis='y', labelcolor='black')
+    artists = canvas.artists
+    for line, (idx, component) in zip(artists['lines'], plotted):
+        line.set_data(*downsampled(x, filtered_data[component], line.axes))
+    for line, (idx, component) in zip(artists['fraction_lines'], fractions):
+        line.set_data(*downsampled(x, normalized_data[component], line.axes))
+    for line in artists['teq_lines']:
+        line.set_data(*downsampled(x, filtered_data['Equilibrium Temperature (K)'], line.axes))
+    for ax in artists['axes']:
+        ax.relim()
+        ax.autoscale_view()
 
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+    canvas.draw()
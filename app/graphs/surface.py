@@ -1,48 +1,82 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from app.graphs.canvas import PyplotFigure
 
-def plot_superficie(data, x, y, z):
-    x_values = data[x].values
-    y_values = data[y].values
-    z_values = data[z].values
-    
-    unique_x = np.unique(x_values)
-    unique_y = np.unique(y_values)
-    
+def surface_grid(x_values, y_values, z_values):
+    """
+    Grid of z over the unique x and y values, built in one pass from the unique-inverse indices.
+    When several rows share a cell the first one is kept; cells without rows are NaN.
+    """
+    unique_x, ix = np.unique(x_values, return_inverse=True)
+    unique_y, iy = np.unique(y_values, return_inverse=True)
+    cells, first = np.unique(iy * len(unique_x) + ix, return_index=True)
+
+    z_grid = np.full((len(unique_y), len(unique_x)), np.nan)
+    z_grid.flat[cells] = z_values[first]
     x_grid, y_grid = np.meshgrid(unique_x, unique_y)
-    z_grid = np.zeros_like(x_grid)
-    for i in range(len(unique_x)):
-        for j in range(len(unique_y)):
-            mask = (x_values == unique_x[i]) & (y_values == unique_y[j])
-            if np.any(mask):
-                z_grid[j, i] = z_values[mask][0] 
+    return x_grid, y_grid, z_grid
+
+
+def upsample_grid(x_grid, y_grid, z_grid, resolution, method='cubic'):
+    """
+    Interpolates the grid (scipy griddata, NaN cells left out) onto resolution x resolution points
+    spanning the same x and y ranges, for a smooth surface from a coarse sweep.
+    """
+    from scipy.interpolate import griddata
+
+    known = ~np.isnan(z_grid)
+    fine_x, fine_y = np.meshgrid(np.linspace(x_grid.min(), x_grid.max(), resolution),
+                                 np.linspace(y_grid.min(), y_grid.max(), resolution))
+    fine_z = griddata((x_grid[known], y_grid[known]), z_grid[known], (fine_x, fine_y),
+                      method=method, rescale=True)
+    return fine_x, fine_y, fine_z
+
+
+def plot_superficie(data, x, y, z, canvas=None, resolution=None):
+    """
+    Response surface and contour map of z over the (x, y) grid, drawn into canvas (a PlotWindow) or,
+    without it, a pyplot figure. With resolution, the grid is interpolated onto resolution x resolution
+    points before plotting.
+    """
+    x_grid, y_grid, z_grid = surface_grid(data[x].values, data[y].values, data[z].values)
+    if resolution and resolution > max(z_grid.shape):
+        x_grid, y_grid, z_grid = upsample_grid(x_grid, y_grid, z_grid, resolution)
 
-    fig = plt.figure(figsize=(10, 4))
+    title = z if z == "Equilibrium Temperature (K)" else f'{z} (mols)'
+
+    canvas = canvas or PyplotFigure(figsize=(10, 4))
+    if canvas.prepare(('surface',)):
+        fig = canvas.figure
+        ax1 = fig.add_subplot(121, projection='3d')
+        ax2 = fig.add_subplot(122)
+        # Eixos fixos das barras de cor: a cada gráfico só o conteúdo delas é redesenhado
+        cax1 = ax1.inset_axes([1.12, 0.1, 0.04, 0.8])
+        cax2 = ax2.inset_axes([1.08, 0.0, 0.04, 1.0])
+        canvas.artists.update(ax1=ax1, ax2=ax2, cax1=cax1, cax2=cax2, surf=None, contour=None)
+
+    artists = canvas.artists
+    ax1, ax2 = artists['ax1'], artists['ax2']
+
+    # A superfície 3D e o contorno preenchido não têm set_data: só esses artistas são trocados
+    if artists['surf'] is not None:
+        artists['surf'].remove()
+        artists['contour'].remove()
 
-    ax1 = fig.add_subplot(121, projection='3d')
     surf = ax1.plot_surface(x_grid, y_grid, z_grid, cmap='coolwarm', edgecolor='none')
     ax1.set_xlabel(x, labelpad=10, fontsize=9, style='italic')
     ax1.set_ylabel(y, labelpad=10, fontsize=9, style='italic')
-    
-    if z == "Equilibrium Temperature (K)":
-        cbar1 = fig.colorbar(surf, ax=ax1, pad=0.1)
-        cbar1.ax.set_title(label=f'{z}', pad=5, fontweight='bold')
-    else:
-        cbar1 = fig.colorbar(surf, ax=ax1, pad=0.1)
-        cbar1.ax.set_title(label=f'{z} (mols)', pad=5, fontweight='bold')
-
-    ax2 = fig.add_subplot(122)
+    ax1.auto_scale_xyz(x_grid, y_grid, z_grid)
+
     c = ax2.contourf(x_grid, y_grid, z_grid, cmap='coolwarm', levels=50)
     ax2.set_xlabel(x, labelpad=10, fontsize=9, style='italic')
     ax2.set_ylabel(y, labelpad=10, fontsize=9, style='italic')
-    
-    if z == "Equilibrium Temperature (K)":
-        cbar2 = plt.colorbar(c, ax=ax2, pad=0.1)
-        cbar2.ax.set_title(label=f'{z}', pad=10, fontweight='bold')
-    else:
-        cbar2 = plt.colorbar(c, ax=ax2, pad=0.1)
-        cbar2.ax.set_title(label=f'{z} (mols)', pad=10, fontweight='bold')
-
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    ax2.relim()
+    ax2.autoscale_view()
+
+    for cax, mappable, pad in ((artists['cax1'], surf, 5), (artists['cax2'], c, 10)):
+        cax.clear()
+        colorbar = canvas.figure.colorbar(mappable, cax=cax)
+        colorbar.ax.set_title(label=title, pad=pad, fontweight='bold')
+
+    artists.update(surf=surf, contour=c)
+    canvas.draw()
@@ -1,9 +1,11 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QGridLayout, QLabel, QPushButton, QComboBox, QMessageBox
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from app.graphs import plot_superficie
-from app.graphs import linear_graph_maxs
-from app.graphs import plot_correlation_matrix
+from app.auxiliar_func.results_writer import read_results, result_columns
+
+# Resolutions offered for the surface plot: 'Grid' draws the simulated points as they are, a number
+# interpolates the surface onto that many points per axis (see plot_superficie).
+SURFACE_RESOLUTIONS = ['Grid', '50', '100', '200']
 
 class CheckableComboBox(QComboBox):
     def __init__(self, parent=None):
@@ -54,8 +56,14 @@ class CheckableComboBox(QComboBox):
         """)
 
 class Section3(QFrame):
-    def __init__(self, dataframe, components, reference_componente, parent=None):
+    def __init__(self, dataframe, components, reference_componente, parent=None, plot_window=None):
+        # dataframe pode ser o DataFrame de resultados ou o caminho do arquivo gravado durante a varredura;
+        # neste caso as colunas são lidas do arquivo somente quando necessárias.
         super().__init__(parent)
+        # Janela de gráficos persistente, reaproveitada por todos os botões (e pelas próximas simulações da tela)
+        self.plot_window = plot_window
+        # Índice dos resultados para os gráficos de composição, criado no primeiro clique
+        self.results_index = None
         self.setMaximumHeight(180)
         self.setStyleSheet("""
             QLabel {
@@ -71,14 +79,16 @@ class Section3(QFrame):
         self.surface_button.clicked.connect(lambda: self.plot_surface_response(dataframe))
         grid_layout.addWidget(self.surface_button, 0, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignCenter)
 
+        columns = result_columns(dataframe)
+
         # X Value
-        self.x_value_combobox = self._add_labeled_combobox(grid_layout, dataframe.columns, "X Value:", 1, 0)
+        self.x_value_combobox = self._add_labeled_combobox(grid_layout, columns, "X Value:", 1, 0)
 
         # Y Value
-        self.y_value_combobox = self._add_labeled_combobox(grid_layout, dataframe.columns, "Y Value:", 2, 0)
+        self.y_value_combobox = self._add_labeled_combobox(grid_layout, columns, "Y Value:", 2, 0)
 
         # Z Value
-        self.z_value_combobox = self._add_labeled_combobox(grid_layout, dataframe.columns, "Z Value:", 3, 0)
+        self.z_value_combobox = self._add_labeled_combobox(grid_layout, columns, "Z Value:", 3, 0)
 
         # Component
         self.component_combobox = CheckableComboBox()
@@ -99,21 +109,25 @@ class Section3(QFrame):
 
         # N Value graph T
         name_colum = reference_componente + " Initial"
-        self.n_value_combobox_graphT = self._add_labeled_combobox(grid_layout, dataframe[name_colum].unique().astype(str), "N Value:", 1, 3)
-        self.p_value_combobox_graphT = self._add_labeled_combobox(grid_layout, dataframe['Pressure'].unique().astype(str), "P Value:", 1, 5)
+        axes = read_results(dataframe, [name_colum, 'Pressure', 'Initial Temperature'])
+        self.n_value_combobox_graphT = self._add_labeled_combobox(grid_layout, axes[name_colum].unique().astype(str), "N Value:", 1, 3)
+        self.p_value_combobox_graphT = self._add_labeled_combobox(grid_layout, axes['Pressure'].unique().astype(str), "P Value:", 1, 5)
 
         # N Value graph P
-        self.n_value_combobox_graphP = self._add_labeled_combobox(grid_layout, dataframe[name_colum].unique().astype(str), "N Value:", 2, 3)
-        self.t_value_combobox_graphP = self._add_labeled_combobox(grid_layout, dataframe['Initial Temperature'].unique().astype(str), "T Value:", 2, 5)
+        self.n_value_combobox_graphP = self._add_labeled_combobox(grid_layout, axes[name_colum].unique().astype(str), "N Value:", 2, 3)
+        self.t_value_combobox_graphP = self._add_labeled_combobox(grid_layout, axes['Initial Temperature'].unique().astype(str), "T Value:", 2, 5)
 
         # P Value graph N
-        self.p_value_combobox_graphN = self._add_labeled_combobox(grid_layout, dataframe['Pressure'].unique().astype(str), "P Value:", 3, 3)
-        self.t_value_combobox_graphN = self._add_labeled_combobox(grid_layout, dataframe['Initial Temperature'].unique().astype(str), "T Value:", 3, 5)
+        self.p_value_combobox_graphN = self._add_labeled_combobox(grid_layout, axes['Pressure'].unique().astype(str), "P Value:", 3, 3)
+        self.t_value_combobox_graphN = self._add_labeled_combobox(grid_layout, axes['Initial Temperature'].unique().astype(str), "T Value:", 3, 5)
 
         # Correlation Matrix Button
         self.correlation_matrix_button = self._create_button("Correlation Matrix", "#F44336", 10, row=0, col=7, layout=grid_layout)
         self.correlation_matrix_button.clicked.connect(lambda: self.plot_correlation(dataframe))
 
+        # Surface resolution
+        self.resolution_combobox = self._add_labeled_combobox(grid_layout, SURFACE_RESOLUTIONS, "Resolution:", 1, 7)
+
         grid_layout.setColumnStretch(1, 2)
         grid_layout.setColumnStretch(4, 2)
 
@@ -121,6 +135,12 @@ class Section3(QFrame):
         self.setLayout(section_layout)
         self.setVisible(False)
 
+    def canvas(self):
+        if self.plot_window is None:
+            from app.graphs.canvas import PlotWindow
+            self.plot_window = PlotWindow("TeS - Graphs", self.window())
+        return self.plot_window
+
     def _create_button(self, text, color, font_size, row=None, col=None, layout=None):
         button = QPushButton(text)
         button.setStyleSheet(f"""
@@ -206,6 +226,7 @@ class Section3(QFrame):
         x_value = self.x_value_combobox.currentText()
         y_value = self.y_value_combobox.currentText()
         z_value = self.z_value_combobox.currentText()
+        dataframe = read_results(dataframe, list(dict.fromkeys([x_value, y_value, z_value])))
 
         if dataframe[x_value].nunique() < 5 or dataframe[y_value].nunique() < 5:
             msg = QMessageBox()
@@ -218,7 +239,10 @@ class Section3(QFrame):
             msg.setWindowTitle("Erro de Plotagem")
             msg.exec()
             return
-        plot_superficie(dataframe, x_value, y_value, z_value)
+        from app.graphs.surface import plot_superficie
+        resolution = self.resolution_combobox.currentText()
+        resolution = int(resolution) if resolution.isdigit() else None
+        plot_superficie(dataframe, x_value, y_value, z_value, canvas=self.canvas(), resolution=resolution)
 
     def plot_linear_graphs(self, dataframe, reference_componente, graph_type, components):
         name_colum = reference_componente + " Initial"
@@ -242,10 +266,15 @@ class Section3(QFrame):
             value1, value2 = p_value_n, t_value_n
 
         selected_components = self.component_combobox.getCheckedItems()
-        
-        linear_graph_maxs(dataframe=dataframe, label1=label1, label2=label2, value1=value1, value2=value2, components=components, selected_components=selected_components, name_colum=name_colum, graph_type = graph_type)
+        if self.results_index is None:
+            from app.auxiliar_func.results_index import ResultsIndex
+            self.results_index = ResultsIndex(read_results(dataframe))
+
+        from app.graphs.linearmaxS import linear_graph_maxs
+        linear_graph_maxs(dataframe=self.results_index.frame, label1=label1, label2=label2, value1=value1, value2=value2, components=components, selected_components=selected_components, name_colum=name_colum, graph_type = graph_type, canvas=self.canvas(), index=self.results_index)
 
     def plot_correlation(self, dataframe):
+        dataframe = read_results(dataframe)
         numeric_df = dataframe.select_dtypes(include='number')
         if len(numeric_df.columns) < 2:
             msg = QMessageBox()
@@ -258,4 +287,5 @@ class Section3(QFrame):
             msg.setWindowTitle("Erro de Plotagem")
             msg.exec()
             return
-        plot_correlation_matrix(df=dataframe)
\ No newline at end of file
+        from app.graphs.correlation import plot_correlation_matrix
+        plot_correlation_matrix(df=dataframe, canvas=self.canvas())
\ No newline at end of file
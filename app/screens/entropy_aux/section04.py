@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QApplication, QFrame, QVBoxLayout, QTableWidget, QTa
 from PyQt6.QtCore import Qt
 import sys
 import pandas as pd
+from app.auxiliar_func.results_writer import read_results, result_columns
 
 class Section4(QFrame):
     def __init__(self, dataframe, components, parent=None):
@@ -10,6 +11,9 @@ class Section4(QFrame):
         section_layout = QVBoxLayout()
 
         self.original_data = dataframe
+        # Somente as colunas usadas na tabela são lidas quando os resultados estão em arquivo
+        dataframe = read_results(dataframe, [col for col in result_columns(dataframe)
+                                             if col in list(components) or col in ('Initial Temperature', 'Pressure') or col.endswith('Initial')])
         results = []
         for component in components:
             if component in dataframe.columns:
@@ -75,7 +79,9 @@ class Section4(QFrame):
 
         for row in range(len(results_df)):
             for col in range(len(results_df.columns)):
-                item = QTableWidgetItem(str(results_df.iloc[row, col]))
+                value = results_df.iloc[row, col]
+                # Arredondamento apenas para exibição; os resultados mantêm a precisão completa
+                item = QTableWidgetItem(str(round(value, 3)) if isinstance(value, float) else str(value))
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.results_table.setItem(row, col, item)
                 self.results_table.setRowHeight(row, row_height)
@@ -112,9 +118,9 @@ class Section4(QFrame):
 
             if file_name:
                 if file_name.endswith('.csv'):
-                    self.original_data.to_csv(file_name, index=False)
+                    read_results(self.original_data).to_csv(file_name, index=False)
                 elif file_name.endswith('.xlsx'):
-                    self.original_data.to_excel(file_name, index=False)
+                    read_results(self.original_data).to_excel(file_name, index=False)
                 
                 msg_box = QMessageBox(self)
                 msg_box.setIcon(QMessageBox.Icon.Information)
@@ -1,3 +1,4 @@
+import logging
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QFrame, QPushButton, QLabel,
@@ -7,10 +8,14 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt
 from app.auxiliar_func.read_data import ReadData
-from app.auxiliar_func.run_gibbs import RunGibbs
 from app.screens.ming_aux.section03 import Section3
 from app.screens.ming_aux.section04 import Section4
 from app.find_path import resource_path
+from app.auxiliar_func.parallel import available_workers
+from app.auxiliar_func.results_writer import writer_path
+from app.screens.simulation_worker import SimulationThread, ProgressPanel
+
+logger = logging.getLogger(__name__)
 
 class MinG(QWidget):
     def __init__(self):
@@ -29,7 +34,10 @@ class MinG(QWidget):
         self.section3_container = QFrame()
         self.section3_container.setFixedHeight(210)
         section3_layout = QVBoxLayout()
+        self.progress_panel = ProgressPanel()
+        section3_layout.addWidget(self.progress_panel)
         self.section3_container.setLayout(section3_layout)
+        self.simulation = None
 
         # Adiciona o container ao layout principal
         layout.addWidget(self.section3_container)
@@ -67,6 +75,8 @@ class MinG(QWidget):
         self.n_pressure = 0
         self.n_component_values = 0
         self.state_equation = None
+        self.workers = 1
+        self.output_path = None
         self.total_simulations = None
         self.results = None
         
@@ -120,6 +130,12 @@ class MinG(QWidget):
         else:
             self.n_component_values = int(self.n_values_n_input.text())
 
+        if self.workers_input.text():
+            self.workers = max(1, int(self.workers_input.text()))
+        else:
+            self.workers = 1
+        self.output_path = self.output_input.text().strip() or None
+
         self.reference_componente = self.component_combobox.currentText()
         self.inhibit_component = self.inhibit_component_combox.currentText()
         self.state_equation = self.state_equation_combobox.currentText()
@@ -137,58 +153,85 @@ class MinG(QWidget):
             self.section3_container.layout().removeWidget(self.section3)
             self.section3.deleteLater()
 
-        self.section3 = Section3(results, components, reference_componente)
+        plot_window = self.section3.plot_window if self.section3 else None
+        self.section3 = Section3(results, components, reference_componente, plot_window=plot_window)
         self.section3.setMaximumHeight(175)
         self.section3_container.layout().addWidget(self.section3)
         self.section3.setVisible(True)
 
     def run_gibbs(self):
+        if self.simulation is not None and self.simulation.isRunning():
+            return
         if self.collect_input_values():
+            # Importado aqui para que o pyomo só seja carregado na primeira simulação
+            from app.auxiliar_func.run_gibbs import RunGibbs
+
             gibbs = RunGibbs(data=self.data, species=self.species, initial=self.initial, 
                             components=self.components, Tmin=self.tmin, Tmax=self.tmax,
                             Pmin=self.pmin, Pmax=self.pmax, nT=self.n_temperature, nP=self.n_pressure, 
                             kij=self.kij,
                             reference_componente=self.reference_componente, reference_componente_min=self.reference_componente_min, 
                             reference_componente_max=self.reference_componente_max, n_reference_componente=self.n_component_values, 
-                            inhibit_component=self.inhibit_component, state_equation=self.state_equation)
-            self.results = gibbs.run_gibbs()
+                            inhibit_component=self.inhibit_component, state_equation=self.state_equation,
+                            workers=self.workers, output_path=self.output_path)
+            # A varredura roda em uma thread separada para não travar a janela
+            self.simulation = SimulationThread(gibbs, gibbs.run_gibbs, self)
+            self.simulation.completed.connect(self.on_simulation_completed)
+            self.simulation.failed.connect(self.on_simulation_failed)
+            self.progress_panel.start(self.simulation)
+            self.simulation.start()
+        else:
+            logger.warning("Simulation aborted due to missing input fields.")
+
+    def on_simulation_completed(self, results):
+        self.results = results
 
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Icon.Information)
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Icon.Information)
+        if self.simulation.runner.cancelled:
+            msg_box.setWindowTitle("Simulation Cancelled")
+            msg_box.setText(f"The Gibbs simulation was cancelled. {len(results)} solved points were kept.")
+        else:
             msg_box.setWindowTitle("Simulation Complete")
             msg_box.setText("The Gibbs simulation has been successfully completed!")
-            msg_box.setStyleSheet("""
-                                    QLabel { 
-                                        color: black; 
-                                    }
-                                    QPushButton { 
-                                        color: black;
-                                        background-color: #E1E1E1;
-                                        border: 1px solid #ADADAD;
-                                        padding: 5px 15px;
-                                        border-radius: 3px;
-                                    }
-                                    QPushButton:hover {
-                                        background-color: #F0F0F0;
-                                    }
-                                    QPushButton:pressed {
-                                        background-color: #C0C0C0;
-                                    }
-                                """)
-            msg_box.exec()
-            self.show_section3(self.results, self.components, self.reference_componente)
-
-            if self.section4 is not None:
-                for i in reversed(range(self.section4_container.layout().count())): 
-                    widget = self.section4_container.layout().itemAt(i).widget()
-                    if widget is not None: 
-                        widget.deleteLater()
-
-            self.section4 = Section4(self.results, self.components)
-            self.section4_container.layout().addWidget(self.section4)
-            self.section4.setVisible(True)
-        else:
-            print("Simulation aborted due to missing input fields.")
+        msg_box.setStyleSheet("""
+                                QLabel { 
+                                    color: black; 
+                                }
+                                QPushButton { 
+                                    color: black;
+                                    background-color: #E1E1E1;
+                                    border: 1px solid #ADADAD;
+                                    padding: 5px 15px;
+                                    border-radius: 3px;
+                                }
+                                QPushButton:hover {
+                                    background-color: #F0F0F0;
+                                }
+                                QPushButton:pressed {
+                                    background-color: #C0C0C0;
+                                }
+                            """)
+        msg_box.exec()
+        if results.empty:
+            return
+
+        # Com um arquivo de saída, as seções leem as colunas de que precisam direto do arquivo
+        source = writer_path(self.output_path) if self.output_path is not None else self.results
+        self.show_section3(source, self.components, self.reference_componente)
+
+        if self.section4 is not None:
+            for i in reversed(range(self.section4_container.layout().count())): 
+                widget = self.section4_container.layout().itemAt(i).widget()
+                if widget is not None: 
+                    widget.deleteLater()
+
+        self.section4 = Section4(source, self.components)
+        self.section4_container.layout().addWidget(self.section4)
+        self.section4.setVisible(True)
+
+    def on_simulation_failed(self, message):
+        QMessageBox.warning(self, "Simulation Error", f"The simulation stopped with an error:\n{message}")
 
     def create_separator(self):
         separator = QFrame()
@@ -350,6 +393,14 @@ class MinG(QWidget):
             except (FileNotFoundError, ValueError, KeyError) as e:
                 QMessageBox.critical(self, "File Error", f"Failed to read or process the file:\n{e}")
 
+    def output_file_dialog(self):
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Output File", "",
+            "Parquet Files (*.parquet);;Arrow Files (*.arrow *.feather);;CSV Files (*.csv)"
+        )
+        if file_name:
+            self.output_input.setText(file_name)
+
     def populate_table(self):
         self.table.setRowCount(len(self.dataframe))
 
@@ -475,6 +526,25 @@ class MinG(QWidget):
         """)
         grid_layout.addWidget(self.inhibit_component_combox, 4, 3)
 
+        grid_layout.addWidget(QLabel("Workers:"), 5, 2)
+        self.workers_input = QLineEdit("1")
+        self.workers_input.setToolTip(f"Parallel processes for the sweep (1 to {available_workers()}).")
+        self.workers_input.setStyleSheet(line_edit_style)  # Aplica o estilo
+        grid_layout.addWidget(self.workers_input, 5, 3)
+
+        grid_layout.addWidget(QLabel("Output File:"), 6, 2)
+        output_layout = QHBoxLayout()
+        self.output_input = QLineEdit()
+        self.output_input.setPlaceholderText("Optional")
+        self.output_input.setToolTip("Writes the results to a .parquet, .arrow or .csv file while the sweep runs.")
+        self.output_input.setStyleSheet(line_edit_style)
+        output_layout.addWidget(self.output_input)
+        output_button = QPushButton("...")
+        output_button.setFixedWidth(30)
+        output_button.clicked.connect(self.output_file_dialog)
+        output_layout.addWidget(output_button)
+        grid_layout.addLayout(output_layout, 6, 3)
+
 
         section_layout.addLayout(grid_layout)
         section.setLayout(section_layout)
@@ -0,0 +1,123 @@
+import time
+from PyQt6.QtWidgets import QFrame, QHBoxLayout, QProgressBar, QLabel, QPushButton
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class SimulationThread(QThread):
+    """
+    Runs a sweep (RunGibbs.run_gibbs or RunEntropy.run_entropy) outside the event loop thread.
+    The runner reports every solved point through the progress signal.
+    """
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, runner, run, parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.run_sweep = run
+        self.runner.progress_callback = self.progress.emit
+
+    def run(self):
+        try:
+            results = self.run_sweep()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.completed.emit(results)
+
+    def cancel(self):
+        self.runner.cancel()
+
+
+class ProgressPanel(QFrame):
+    """
+    Progress bar with the throughput (points per second), the estimated time left and a Cancel button.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedHeight(30)
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid black;
+                border-radius: 5px;
+                color: black;
+                text-align: center;
+                font-size: 10px;
+            }
+            QProgressBar::chunk {
+                background-color: #28a745;
+                border-radius: 5px;
+            }
+        """)
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: black; font-size: 10px;")
+        self.status_label.setMinimumWidth(220)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFixedSize(80, 24)
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                border-radius: 5px;
+                background-color: #F44336;
+                color: white;
+                border: 1px solid #d32f2f;
+            }
+            QPushButton:hover {
+                background-color: #d32f2f;
+            }
+        """)
+
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.cancel_button)
+        self.setLayout(layout)
+
+        self.thread = None
+        self.start_time = None
+        self.start_done = 0
+        self.setVisible(False)
+
+    def start(self, thread):
+        self.thread = thread
+        self.start_time = time.monotonic()
+        self.start_done = None
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Starting...")
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.clicked.connect(self.cancel)
+        thread.progress.connect(self.update_progress)
+        thread.finished.connect(self.finish)
+        self.setVisible(True)
+
+    def update_progress(self, done, total):
+        # Points recovered from a checkpoint at the start do not count towards the throughput.
+        if self.start_done is None:
+            self.start_done = done
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+        elapsed = time.monotonic() - self.start_time
+        solved = done - self.start_done
+        if solved > 0 and elapsed > 0:
+            rate = solved / elapsed
+            eta = (total - done) / rate
+            minutes, seconds = divmod(int(eta), 60)
+            self.status_label.setText(f"{done}/{total} points  |  {rate:.1f} points/s  |  ETA {minutes:02d}:{seconds:02d}")
+        else:
+            self.status_label.setText(f"{done}/{total} points")
+
+    def cancel(self):
+        if self.thread is not None:
+            self.thread.cancel()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+
+    def finish(self):
+        self.cancel_button.clicked.disconnect(self.cancel)
+        self.thread = None
+        self.setVisible(False)
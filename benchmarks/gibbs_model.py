@@ -0,0 +1,55 @@
+"""
+Time per point of Gibbs.solve_gibbs with the model rebuilt at every point (persistent=False)
+against the build-once model (persistent=True).
+
+Usage:
+    python -m benchmarks.gibbs_model [nT] [nP] [nN]
+"""
+import sys
+import time
+import numpy as np
+from app.auxiliar_func.read_data import ReadData
+from app.gibbs import Gibbs
+from app.auxiliar_func.get_solver import get_ipopt_solver
+
+
+def sweep_points(initial, nT, nP, nN):
+    for T in np.linspace(600, 1200, nT):
+        for P in np.linspace(1, 20, nP):
+            for n in np.linspace(0.5, 2.0, nN):
+                feed = initial.astype(float).copy()
+                feed[0] = n
+                yield feed, T, P
+
+
+def time_sweep(document, persistent, nT, nP, nN, solve):
+    gibbs = Gibbs(document.data, document.species, document.components, '---', document.kij, 'Ideal Gas', persistent=persistent)
+    start = time.perf_counter()
+    points = 0
+    for feed, T, P in sweep_points(document.initial, nT, nP, nN):
+        if solve:
+            gibbs.solve_gibbs(feed, T, P)
+        else:
+            feed[feed == 0] = 0.00001
+            gibbs.update_model(feed, T, P)
+        points += 1
+    return (time.perf_counter() - start) / points
+
+
+def main():
+    nT, nP, nN = (int(arg) for arg in (sys.argv[1:4] if len(sys.argv) >= 4 else (5, 5, 5)))
+    document = ReadData('thermodynamic_data.xlsx')
+    solve = get_ipopt_solver().available(exception_flag=False)
+    if not solve:
+        print("IPOPT not available: timing model setup only.")
+
+    before = time_sweep(document, False, nT, nP, nN, solve)
+    after = time_sweep(document, True, nT, nP, nN, solve)
+    print(f"Grid {nT}x{nP}x{nN}")
+    print(f"Rebuilt model   : {before * 1e3:8.3f} ms/point")
+    print(f"Persistent model: {after * 1e3:8.3f} ms/point")
+    print(f"Speedup         : {before / after:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Closed-form, vectorized gibbs_pad against the nested-quad reference implementation.
+
+Usage:
+    python -m benchmarks.gibbs_pad [nT]
+"""
+import sys
+import time
+import numpy as np
+from app.auxiliar_func.read_data import ReadData
+from app.auxiliar_func.gibbsZero import gibbs_pad, gibbs_pad_quad
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - start)
+    return min(times), value
+
+
+def main():
+    nT = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    document = ReadData('thermodynamic_data.xlsx')
+    temperatures = np.linspace(300, 1500, nT)
+
+    quad_time, reference = best_of(lambda: np.array([gibbs_pad_quad(T, document.data) for T in temperatures]), repeat=1)
+    closed_time, closed = best_of(lambda: gibbs_pad(temperatures, document.data))
+    relative = np.max(np.abs(closed - reference) / np.maximum(np.abs(reference), 1.0))
+
+    print(f"{nT} temperatures x {len(document.data)} components")
+    print(f"quad       : {quad_time * 1e3:10.3f} ms")
+    print(f"closed form: {closed_time * 1e3:10.3f} ms")
+    print(f"Speedup    : {quad_time / closed_time:10.1f}x")
+    print(f"Max. relative deviation: {relative:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+ReadData load time against the number of components: the previous loader (two workbook reads and
+iterrows), a single read without the cache, and a load from the per-user cache.
+
+Usage:
+    python -m benchmarks.read_data [n1 n2 ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from app.auxiliar_func.read_data import ReadData
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - start)
+    return min(times), value
+
+
+def write_workbook(path, base, ncomp):
+    """
+    Writes a workbook with ncomp components, repeating the rows of the base workbook under new names.
+    """
+    repeats = -(-ncomp // len(base))
+    info = pd.concat([base] * repeats, ignore_index=True).iloc[:ncomp].copy()
+    info['Component'] = [f"{name}_{i}" for i, name in enumerate(info['Component'])]
+    kij = pd.DataFrame(0.0, index=info['Component'], columns=info['Component'])
+    with pd.ExcelWriter(path) as writer:
+        info.to_excel(writer, sheet_name='Informations', index=False)
+        kij.to_excel(writer, sheet_name='kij')
+
+
+def read_previous(path):
+    full_data = pd.read_excel(path, sheet_name='Informations')
+    data_dict = {row['Component']: row.to_dict() for index, row in full_data.iterrows()}
+    components = full_data['Component'].values
+    df_kij = pd.read_excel(path, sheet_name='kij', index_col=0)
+    return data_dict, df_kij.reindex(index=components, columns=components, fill_value=0)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 500]
+    base = ReadData('thermodynamic_data.xlsx', use_cache=False).dataframe
+
+    print(f"{'components':>10} {'previous':>12} {'single read':>12} {'cached':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for ncomp in sizes:
+            path = os.path.join(directory, f"workbook_{ncomp}.xlsx")
+            write_workbook(path, base, ncomp)
+
+            previous_time, (previous_data, _) = best_of(lambda: read_previous(path))
+            single_time, document = best_of(lambda: ReadData(path, use_cache=False))
+            ReadData(path)
+            cached_time, cached = best_of(lambda: ReadData(path))
+            assert cached.data == document.data == previous_data
+
+            print(f"{ncomp:>10d} {previous_time * 1e3:10.1f} ms {single_time * 1e3:10.1f} ms {cached_time * 1e3:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
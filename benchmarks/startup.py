@@ -0,0 +1,53 @@
+"""
+Import cost of the entry points and of the heavy libraries they load, measured in fresh
+interpreters with `python -X importtime`.
+
+Usage:
+    python -m benchmarks.startup [module ...]
+"""
+import os
+import subprocess
+import sys
+
+TARGETS = ['main', 'cli', 'app.screens.ming', 'app.screens.maxs', 'app.auxiliar_func.run_gibbs', 'app.graphs.surface']
+HEAVY = ['PyQt6', 'pandas', 'pyomo', 'scipy', 'matplotlib', 'seaborn']
+
+
+def import_times(module):
+    """
+    Returns the import time of a fresh `import module` in ms and the time spent in each top-level
+    package it loads (sum of the self times of its modules), or None when the import fails.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        return None
+    total = 0.0
+    packages = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        packages[name.split('.')[0]] = packages.get(name.split('.')[0], 0.0) + int(self_us) / 1000
+        if name == module:
+            total = int(cumulative_us) / 1000
+    return total, packages
+
+
+def main():
+    targets = sys.argv[1:] or TARGETS
+    print(f"{'module':<30} {'total':>9} " + ' '.join(f"{name:>10}" for name in HEAVY))
+    for module in targets:
+        measured = import_times(module)
+        if measured is None:
+            print(f"{module:<30} {'failed':>9}")
+            continue
+        total, packages = measured
+        loaded = ' '.join(f"{packages[name]:8.0f}ms" if name in packages else f"{'-':>10}" for name in HEAVY)
+        print(f"{module:<30} {total:7.0f}ms {loaded}")
+
+
+if __name__ == '__main__':
+    main()
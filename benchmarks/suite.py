@@ -0,0 +1,369 @@
+"""
+Benchmark suite of the thermodynamic hot paths, run on the shipped thermodynamic_data.xlsx.
+
+Every benchmark is timed asv-style: the call is repeated until a sample takes at least
+MIN_SAMPLE_TIME, several samples are taken, and the minimum and median time per call are kept.
+Results are stored in benchmarks/results/<machine>/<commit>.json, so two commits measured on the
+same machine can be compared.
+
+Usage:
+    python -m benchmarks.suite                       # runs every benchmark and stores the results
+    python -m benchmarks.suite -k fug -k bnds        # only benchmarks whose name contains a pattern
+    python -m benchmarks.suite --sizes small medium  # sweep sizes to run (small, medium, large)
+    python -m benchmarks.suite --compare A B         # compares two stored commits (A is the baseline)
+    python -m benchmarks.suite --list                # lists the stored results of this machine
+
+Benchmarks that need IPOPT (solve_gibbs with the IPOPT engine, solve_entropy and the entropy
+sweeps) are recorded as skipped when no IPOPT is available, and solve_gibbs.cyipopt (the in-process
+backend of get_ipopt_solver) when cyipopt is missing; the Gibbs sweeps then use the RAND engine,
+and the engine is part of the benchmark name so such results are never compared with IPOPT ones.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+
+WORKBOOK = 'thermodynamic_data.xlsx'
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+EQUATIONS = ['Ideal Gas', 'Peng-Robinson', 'Soave-Redlich-Kwong', 'Redlich-Kwong', 'Virial']
+MIN_SAMPLE_TIME = 0.05
+REPEAT = 5
+
+# Grid sizes of the sweeps: (nT, nP, n values of the reference component).
+SWEEP_SIZES = {
+    'small': (5, 5, 1),
+    'medium': (10, 10, 3),
+    'large': (20, 20, 5),
+}
+
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=REPEAT, number=None):
+    """
+    Registers a benchmark. The decorated function receives the suite context and returns the
+    callable to time (its setup runs once, outside the timing), or None to skip the benchmark.
+    number fixes the calls per sample instead of calibrating it (used by the sweeps).
+    """
+    def register(setup):
+        BENCHMARKS.append({'name': name, 'setup': setup, 'repeat': repeat, 'number': number})
+        return setup
+    return register
+
+
+def time_call(func, repeat, number=None):
+    """
+    Returns the minimum and median time per call (s) over repeat samples, and the calls per sample.
+    """
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= MIN_SAMPLE_TIME:
+                break
+            number *= 10
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples), statistics.median(samples), number
+
+
+class Context:
+    """
+    Shared state of a suite run: the workbook, a fixed test state and whether IPOPT is available.
+    """
+    def __init__(self, sizes):
+        from app.auxiliar_func.read_data import ReadData
+        from app.auxiliar_func.get_solver import get_ipopt_solver, InProcessIpopt
+        import app.auxiliar_func.point_cache as point_cache
+
+        # The on-disk point cache would turn the solve benchmarks into cache lookups.
+        point_cache.POINT_CACHE_PATH = None
+
+        self.document = ReadData(WORKBOOK)
+        self.sizes = sizes
+        self.ipopt = get_ipopt_solver().available(exception_flag=False)
+        self.cyipopt = InProcessIpopt().available(exception_flag=False)
+        self.gibbs_engine = 'ipopt' if self.ipopt else 'rand'
+
+        # Feed with every component present, so no term of the EoS vanishes.
+        self.feed = np.where(self.document.initial > 0, self.document.initial, 0.1).astype(float)
+        self.T = 900.0
+        self.P = 10.0
+
+    def runner_arguments(self, size):
+        nT, nP, nN = SWEEP_SIZES[size]
+        document = self.document
+        return dict(data=document.data, species=document.species, initial=document.initial,
+                    components=document.components, Tmin=600, Tmax=1200, Pmin=1, Pmax=20, nT=nT, nP=nP,
+                    reference_componente='Methane', reference_componente_min=0.5, reference_componente_max=2.0,
+                    n_reference_componente=nN, inhibit_component='---')
+
+
+@benchmark('read_data.workbook')
+def read_data_workbook(context):
+    from app.auxiliar_func.read_data import ReadData
+    return lambda: ReadData(WORKBOOK, use_cache=False)
+
+
+@benchmark('read_data.cached')
+def read_data_cached(context):
+    from app.auxiliar_func.read_data import ReadData
+    return lambda: ReadData(WORKBOOK)
+
+
+@benchmark('gibbs_pad.scalar')
+def gibbs_pad_scalar(context):
+    from app.auxiliar_func.gibbsZero import gibbs_pad
+    return lambda: gibbs_pad(context.T, context.document.data)
+
+
+@benchmark('gibbs_pad.vector_1000')
+def gibbs_pad_vector(context):
+    from app.auxiliar_func.gibbsZero import gibbs_pad
+    temperatures = np.linspace(300, 1500, 1000)
+    return lambda: gibbs_pad(temperatures, context.document.data)
+
+
+def fug_benchmark(equation):
+    def setup(context):
+        from app.auxiliar_func.eos import fug
+        document = context.document
+        return lambda: fug(context.T, context.P, equation, context.feed, document.data, document.kij)
+    return setup
+
+
+def fug_batch_benchmark(equation):
+    def setup(context):
+        from app.auxiliar_func.eos import fug_batch
+        document = context.document
+        states = 1000
+        temperatures = np.linspace(600, 1200, states)
+        pressures = np.linspace(1, 20, states)
+        feeds = np.tile(context.feed, (states, 1))
+        return lambda: fug_batch(temperatures, pressures, feeds, equation, document.data, document.kij)
+    return setup
+
+
+for _equation in EQUATIONS:
+    benchmark(f'fug.{_equation}')(fug_benchmark(_equation))
+    benchmark(f'fug_batch_1000.{_equation}')(fug_batch_benchmark(_equation))
+
+
+@benchmark('gibbs.bnds_values')
+def gibbs_bnds_values(context):
+    from app.gibbs import Gibbs
+    document = context.document
+    gibbs = Gibbs(document.data, document.species, document.components, '---', document.kij)
+    return lambda: gibbs.bnds_values(context.feed)
+
+
+@benchmark('entropy.bnds_values')
+def entropy_bnds_values(context):
+    from app.entropy import Entropy
+    document = context.document
+    entropy = Entropy(document.data, document.species, document.components, '---')
+    return lambda: entropy.bnds_values(context.feed)
+
+
+def solve_gibbs_benchmark(engine, backend='ipopt'):
+    def setup(context):
+        if engine == 'ipopt' and not (context.cyipopt if backend == 'cyipopt' else context.ipopt):
+            return None
+        from app.gibbs import Gibbs
+        from app.auxiliar_func.get_solver import get_ipopt_solver
+        document = context.document
+        gibbs = Gibbs(document.data, document.species, document.components, '---', document.kij, engine=engine)
+        gibbs.solver = get_ipopt_solver(backend)
+        # The first call builds the persistent model; the benchmark times the following points.
+        gibbs.solve_gibbs(context.feed, context.T, context.P)
+        return lambda: gibbs.solve_gibbs(context.feed, context.T, context.P)
+    return setup
+
+
+benchmark('solve_gibbs.ipopt')(solve_gibbs_benchmark('ipopt'))
+benchmark('solve_gibbs.cyipopt')(solve_gibbs_benchmark('ipopt', backend='cyipopt'))
+benchmark('solve_gibbs.rand')(solve_gibbs_benchmark('rand'))
+
+
+@benchmark('solve_entropy.ipopt')
+def solve_entropy(context):
+    if not context.ipopt:
+        return None
+    from app.entropy import Entropy
+    document = context.document
+    entropy = Entropy(document.data, document.species, document.components, '---')
+    return lambda: entropy.solve_entropy(context.feed, context.T, context.P)
+
+
+def gibbs_sweep_benchmark(size):
+    def setup(context):
+        if size not in context.sizes:
+            return None
+        from app.auxiliar_func.run_gibbs import RunGibbs
+        arguments = context.runner_arguments(size)
+        return lambda: RunGibbs(kij=context.document.kij, engine=context.gibbs_engine, **arguments).run_gibbs()
+    return setup
+
+
+def entropy_sweep_benchmark(size):
+    def setup(context):
+        if size not in context.sizes or not context.ipopt:
+            return None
+        from app.auxiliar_func.run_entropy import RunEntropy
+        arguments = context.runner_arguments(size)
+        return lambda: RunEntropy(**arguments).run_entropy()
+    return setup
+
+
+for _size in SWEEP_SIZES:
+    benchmark(f'run_gibbs.{_size}', repeat=3 if _size == 'small' else 1, number=1)(gibbs_sweep_benchmark(_size))
+    benchmark(f'run_entropy.{_size}', repeat=3 if _size == 'small' else 1, number=1)(entropy_sweep_benchmark(_size))
+
+
+def benchmark_name(entry, context):
+    # Engine-dependent results carry the engine, so IPOPT and RAND timings are never compared.
+    if entry['name'].startswith('run_gibbs.'):
+        return f"{entry['name']}[{context.gibbs_engine}]"
+    return entry['name']
+
+
+def run_suite(patterns, sizes):
+    context = Context(sizes)
+    results = {}
+    for entry in BENCHMARKS:
+        name = benchmark_name(entry, context)
+        if patterns and not any(pattern in name for pattern in patterns):
+            continue
+        func = entry['setup'](context)
+        if func is not None:
+            best, median, number = time_call(func, entry['repeat'], entry['number'])
+        if func is None:
+            print(f"{name:<40} skipped")
+            results[name] = None
+            continue
+        print(f"{name:<40} {format_time(best):>12} {format_time(median):>12}   ({entry['repeat']} x {number})")
+        results[name] = {'min': best, 'median': median, 'repeat': entry['repeat'], 'number': number}
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if dirty else commit
+
+
+def machine_name():
+    return platform.node() or 'machine'
+
+
+def results_path(commit):
+    return os.path.join(RESULTS_DIR, machine_name(), f"{commit}.json")
+
+
+def save_results(results, sizes):
+    commit = git_commit()
+    path = results_path(commit)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    document = {
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {'name': machine_name(), 'platform': platform.platform(), 'processor': platform.processor(),
+                    'cpus': os.cpu_count(), 'python': platform.python_version()},
+        'sizes': sizes,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    return path
+
+
+def load_results(commit):
+    path = commit if os.path.exists(commit) else results_path(commit)
+    if not os.path.exists(path):
+        raise SystemExit(f"Erro: resultados não encontrados: {path}")
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(baseline, contender, threshold):
+    """
+    Prints the ratio of the median times (contender / baseline) of every benchmark measured in both,
+    flagging changes beyond threshold. Returns the number of regressions.
+    """
+    before = load_results(baseline)
+    after = load_results(contender)
+    print(f"{'benchmark':<40} {before['commit']:>12} {after['commit']:>12} {'ratio':>8}")
+    regressions = 0
+    for name in sorted(set(before['results']) | set(after['results'])):
+        old = before['results'].get(name)
+        new = after['results'].get(name)
+        if not old or not new:
+            continue
+        ratio = new['median'] / old['median']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  slower'
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            flag = '  faster'
+        print(f"{name:<40} {format_time(old['median']):>12} {format_time(new['median']):>12} {ratio:8.2f}{flag}")
+    return regressions
+
+
+def list_results():
+    directory = os.path.join(RESULTS_DIR, machine_name())
+    if not os.path.isdir(directory):
+        print("Nenhum resultado armazenado nesta máquina.")
+        return
+    for name in sorted(os.listdir(directory), key=lambda name: os.path.getmtime(os.path.join(directory, name))):
+        with open(os.path.join(directory, name), encoding='utf-8') as file:
+            stored = json.load(file)
+        print(f"{stored['commit']:<20} {stored['date']}  {len(stored['results'])} benchmarks")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do TeS.")
+    parser.add_argument('-k', dest='patterns', action='append', default=[], help="Roda só os benchmarks cujo nome contém o padrão.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SWEEP_SIZES), default=list(SWEEP_SIZES), help="Tamanhos das varreduras.")
+    parser.add_argument('--no-save', action='store_true', help="Não armazena os resultados.")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help="Compara dois commits (ou arquivos) armazenados.")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Variação relativa considerada significativa na comparação.")
+    parser.add_argument('--list', action='store_true', help="Lista os resultados armazenados nesta máquina.")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        list_results()
+        return 0
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+
+    print(f"{'benchmark':<40} {'min':>12} {'median':>12}")
+    results = run_suite(args.patterns, args.sizes)
+    if not args.no_save:
+        print(f"Resultados salvos em: {save_results(results, args.sizes)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
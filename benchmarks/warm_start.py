@@ -0,0 +1,42 @@
+"""
+Total IPOPT iterations of a RunGibbs sweep started cold at every point against the
+warm-started serpentine continuation.
+
+Usage:
+    python -m benchmarks.warm_start [nT] [nP] [nN]
+"""
+import sys
+import time
+from app.auxiliar_func.read_data import ReadData
+from app.auxiliar_func.run_gibbs import RunGibbs
+
+
+def run_sweep(document, warm_start, nT, nP, nN):
+    runner = RunGibbs(data=document.data, species=document.species, initial=document.initial,
+                      components=document.components, Tmin=600, Tmax=1200, Pmin=1, Pmax=20, nT=nT, nP=nP,
+                      kij=document.kij, reference_componente='Methane', reference_componente_min=0.5,
+                      reference_componente_max=2.0, n_reference_componente=nN, inhibit_component='---',
+                      warm_start=warm_start)
+    start = time.perf_counter()
+    results = runner.run_gibbs()
+    return runner.total_iterations, time.perf_counter() - start, results
+
+
+def main():
+    nT, nP, nN = (int(arg) for arg in (sys.argv[1:4] if len(sys.argv) >= 4 else (10, 10, 5)))
+    document = ReadData('thermodynamic_data.xlsx')
+
+    cold_iterations, cold_time, cold = run_sweep(document, False, nT, nP, nN)
+    warm_iterations, warm_time, warm = run_sweep(document, True, nT, nP, nN)
+    deviation = (cold[document.components] - warm[document.components]).abs().max().max()
+
+    print(f"Grid {nT}x{nP}x{nN}")
+    print(f"Cold start: {cold_iterations:7d} iterations  {cold_time:8.2f} s")
+    print(f"Warm start: {warm_iterations:7d} iterations  {warm_time:8.2f} s")
+    if cold_iterations:
+        print(f"Iteration drop: {100 * (1 - warm_iterations / cold_iterations):.1f} %")
+    print(f"Max. deviation between sweeps: {deviation:.2e} mol")
+
+
+if __name__ == '__main__':
+    main()
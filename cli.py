@@ -0,0 +1,164 @@
+"""
+Runs TeS sweeps from the command line, without the graphical interface.
+
+Usage:
+    python cli.py thermodynamic_data.xlsx --mode gibbs --tmin 600 --tmax 1200 --nt 10 --pmin 1 --pmax 20 --np 5 -o results.parquet
+    python cli.py --job job.json
+
+A job file (JSON, or YAML when PyYAML is installed) holds the same options with underscores,
+e.g. {"workbook": "thermodynamic_data.xlsx", "mode": "entropy", "tmin": 600, ...}.
+Options given on the command line take precedence over the job file.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+EQUATIONS = ['Ideal Gas', 'Peng-Robinson', 'Soave-Redlich-Kwong', 'Redlich-Kwong', 'Virial']
+
+DEFAULTS = {
+    'mode': 'gibbs',
+    'nt': 10,
+    'np': 1,
+    'n_ref': 1,
+    'eos': 'Ideal Gas',
+    'engine': 'ipopt',
+    'workers': 1,
+    'warm_start': False,
+    'adaptive': False,
+    'adaptive_tol': 1e-2,
+    'resume': False,
+    'instrument': False,
+    'robust': False,
+    'log_level': 'INFO',
+    'output': 'results.csv',
+}
+
+REQUIRED = ['workbook', 'tmin', 'tmax', 'pmin', 'pmax']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Thermodynamic Equilibrium Simulation (TeS) sem interface gráfica.")
+    parser.add_argument('workbook', nargs='?', help="Planilha de entrada (.xlsx ou .csv), no formato lido por ReadData.")
+    parser.add_argument('--job', help="Arquivo de job (.json, .yaml ou .yml) com as opções da varredura.")
+    parser.add_argument('--mode', choices=['gibbs', 'entropy'], help="Minimização de Gibbs ou maximização de entropia.")
+    parser.add_argument('--tmin', type=float, help="Temperatura mínima (K).")
+    parser.add_argument('--tmax', type=float, help="Temperatura máxima (K).")
+    parser.add_argument('--nt', type=int, help="Número de valores de temperatura.")
+    parser.add_argument('--pmin', type=float, help="Pressão mínima (bar).")
+    parser.add_argument('--pmax', type=float, help="Pressão máxima (bar).")
+    parser.add_argument('--np', type=int, help="Número de valores de pressão.")
+    parser.add_argument('--reference', help="Componente de referência, cuja quantidade inicial é variada.")
+    parser.add_argument('--ref-min', type=float, help="Quantidade inicial mínima do componente de referência.")
+    parser.add_argument('--ref-max', type=float, help="Quantidade inicial máxima do componente de referência.")
+    parser.add_argument('--n-ref', type=int, help="Número de valores do componente de referência.")
+    parser.add_argument('--inhibit', help="Componente inibido.")
+    parser.add_argument('--eos', choices=EQUATIONS, help="Equação de estado.")
+    parser.add_argument('--engine', choices=['ipopt', 'rand'], help="Método de solução (Gibbs).")
+    parser.add_argument('--workers', type=int, help="Número de processos.")
+    parser.add_argument('--warm-start', action='store_true', default=None, help="Inicializa cada ponto com a solução vizinha (Gibbs).")
+    parser.add_argument('--adaptive', action='store_true', default=None, help="Refina a grade onde a composição varia mais.")
+    parser.add_argument('--adaptive-tol', type=float, help="Tolerância (mol) do refinamento adaptativo.")
+    parser.add_argument('--max-points', type=int, help="Número máximo de pontos do refinamento adaptativo.")
+    parser.add_argument('--cache', help="Arquivo do cache de pontos resolvidos.")
+    parser.add_argument('--checkpoint', help="Arquivo de checkpoint da varredura.")
+    parser.add_argument('--resume', action='store_true', default=None, help="Retoma a varredura a partir do checkpoint.")
+    parser.add_argument('--decimals', type=int, help="Casas decimais dos resultados salvos.")
+    parser.add_argument('--instrument', action='store_true', default=None,
+                        help="Adiciona aos resultados os tempos por fase, as iterações e o status de cada ponto.")
+    parser.add_argument('--robust', action='store_true', default=None,
+                        help="Tenta de novo os pontos que falham e registra como NaN os que não convergem, sem interromper a varredura.")
+    parser.add_argument('--point-time-limit', type=float, help="Tempo máximo (s) por ponto, com as novas tentativas (--robust).")
+    parser.add_argument('--sweep-time-limit', type=float, help="Tempo máximo (s) da varredura; os pontos restantes não são resolvidos.")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help="Nível das mensagens de log.")
+    parser.add_argument('-o', '--output', help="Arquivo de resultados (.csv, .parquet, .arrow ou .xlsx).")
+    return parser
+
+
+def load_job(path):
+    with open(path, encoding='utf-8') as file:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("Erro: PyYAML não está instalado; utilize um arquivo de job em JSON.")
+            job = yaml.safe_load(file) or {}
+        else:
+            job = json.load(file)
+    return {key.replace('-', '_'): value for key, value in job.items()}
+
+
+def job_options(args):
+    """
+    Merges the defaults, the job file and the command line options (in increasing precedence).
+    """
+    options = dict(DEFAULTS)
+    if args.job:
+        options.update(load_job(args.job))
+    options.update({key: value for key, value in vars(args).items() if value is not None and key != 'job'})
+
+    missing = [key for key in REQUIRED if options.get(key) is None]
+    if missing:
+        raise SystemExit(f"Erro: opções obrigatórias ausentes: {', '.join(missing)}.")
+    return options
+
+
+def build_runner(options, document):
+    from app.auxiliar_func.run_gibbs import RunGibbs
+    from app.auxiliar_func.run_entropy import RunEntropy
+
+    output = options['output']
+    streamed = os.path.splitext(output)[1].lower() in ('.csv', '.parquet', '.arrow', '.feather') and options.get('decimals') is None
+    arguments = dict(data=document.data, species=document.species, initial=document.initial, components=document.components,
+                     Tmin=options['tmin'], Tmax=options['tmax'], Pmin=options['pmin'], Pmax=options['pmax'],
+                     nT=options['nt'], nP=options['np'],
+                     reference_componente=options.get('reference'), reference_componente_min=options.get('ref_min'),
+                     reference_componente_max=options.get('ref_max'), n_reference_componente=options['n_ref'],
+                     inhibit_component=options.get('inhibit'), state_equation=options['eos'],
+                     workers=options['workers'], adaptive=options['adaptive'], adaptive_tol=options['adaptive_tol'],
+                     max_points=options.get('max_points'), output_path=output if streamed else None,
+                     cache_path=options.get('cache'), checkpoint_path=options.get('checkpoint'), resume=options['resume'],
+                     instrument=options['instrument'], robust=options['robust'],
+                     point_time_limit=options.get('point_time_limit'), sweep_time_limit=options.get('sweep_time_limit'))
+
+    if options['mode'] == 'gibbs':
+        return RunGibbs(kij=document.kij, warm_start=options['warm_start'], engine=options['engine'], **arguments), streamed
+    return RunEntropy(**arguments), streamed
+
+
+def main(argv=None):
+    options = job_options(build_parser().parse_args(argv))
+    logging.basicConfig(level=options['log_level'].upper(), format='%(levelname)s %(name)s: %(message)s')
+
+    from app.auxiliar_func.read_data import ReadData
+    document = ReadData(options['workbook'])
+    runner, streamed = build_runner(options, document)
+
+    start = time.perf_counter()
+    results = runner.run_gibbs() if options['mode'] == 'gibbs' else runner.run_entropy()
+    elapsed = time.perf_counter() - start
+
+    from app.auxiliar_func.results_writer import ResultsWriter, writer_path
+    output = options['output']
+    if options.get('decimals') is not None:
+        results = results.round(options['decimals'])
+    if output.lower().endswith('.xlsx'):
+        results.to_excel(output, index=False)
+    elif streamed:
+        output = writer_path(output)
+    else:
+        with ResultsWriter(output, list(results.columns)) as writer:
+            for row in results.to_numpy():
+                writer.write(row)
+        output = writer.path
+
+    print(f"{len(results)} pontos resolvidos em {elapsed:.2f} s. Resultados salvos em: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,4 +1,7 @@
+import os
 import sys
+import logging
+import multiprocessing
 from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QStackedWidget, QFrame
 from PyQt6.QtGui import QFont
 from app.screens.initial import InitialScreen
@@ -76,6 +79,8 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentWidget(screen)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=os.environ.get('TES_LOG_LEVEL', 'INFO').upper(), format='%(levelname)s %(name)s: %(message)s')
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
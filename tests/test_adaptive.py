@@ -0,0 +1,39 @@
+import numpy as np
+from app.auxiliar_func.adaptive import adaptive_sweep
+
+
+class StepRunner:
+    """
+    Runner with a sharp step in T, so the adaptive sweep needs several refinement passes.
+    """
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.instances = 0
+
+    def create_instance(self):
+        self.instances += 1
+        return {'solves': 0}
+
+    def solve_point(self, instance, T, P, n, reference_index):
+        instance['solves'] += 1
+        return np.array([np.tanh((T - 905) / 10), P])
+
+
+def coarse_grid():
+    return [(T, P, None) for T in np.linspace(600, 1200, 5) for P in (1.0, 10.0)]
+
+
+def test_serial_passes_reuse_one_instance():
+    runner = StepRunner()
+    points, solved = adaptive_sweep(runner, coarse_grid(), None, lambda row: row, 1e-2, 200)
+
+    assert len(points) > len(coarse_grid())
+    assert runner.instances == 1
+
+
+def test_parallel_matches_serial():
+    serial = adaptive_sweep(StepRunner(), coarse_grid(), None, lambda row: row, 1e-2, 60)
+    parallel = adaptive_sweep(StepRunner(workers=2), coarse_grid(), None, lambda row: row, 1e-2, 60)
+
+    assert serial[0] == parallel[0]
+    np.testing.assert_allclose(serial[1], parallel[1])
@@ -0,0 +1,30 @@
+import numpy as np
+from app.graphs.downsample import minmax_indices
+
+
+def test_bucket_with_nan_keeps_its_extremes():
+    y = np.array([0, 5, 9, np.nan, 1, 2, 3, 4, 6, 7, 8, 1], dtype=float)
+    x = np.arange(len(y), dtype=float)
+    keep = minmax_indices(x, y, 2)
+
+    first_bucket = keep[keep < 6]
+    assert 2 in first_bucket          # spike 9
+    assert 0 in first_bucket          # minimum 0
+    assert 3 in first_bucket          # the failed point stays visible
+
+
+def test_envelope_matches_full_series():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 1, 10000))
+    y = rng.normal(size=10000)
+    y[rng.choice(10000, 200, replace=False)] = np.nan
+    n_buckets = 100
+    keep = minmax_indices(x, y, n_buckets)
+
+    bucket = np.minimum(((x - x[0]) * (n_buckets / (x[-1] - x[0]))).astype(int), n_buckets - 1)
+    for b in range(n_buckets):
+        full = y[bucket == b]
+        kept = y[keep][bucket[keep] == b]
+        assert np.nanmax(kept) == np.nanmax(full)
+        assert np.nanmin(kept) == np.nanmin(full)
+        assert np.isnan(kept).any() == np.isnan(full).any()
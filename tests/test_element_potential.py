@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from app.auxiliar_func.read_data import ReadData
+from app.auxiliar_func.gibbsZero import gibbs_pad
+from app.auxiliar_func.element_potential import rand_equilibrium
+
+R = 8.314
+
+
+@pytest.fixture(scope='module')
+def document():
+    return ReadData('thermodynamic_data.xlsx', use_cache=False)
+
+
+def formula_matrix(document):
+    return np.array([[component[specie] for specie in document.species] for component in document.data.values()], dtype=float)
+
+
+def baseline_gradient(n, g, P, gas):
+    """
+    Gradient of the Gibbs.gibbs_rule objective divided by RT (mole fractions over every component).
+    """
+    n_sum = n.sum()
+    gas_fraction = n[gas].sum() / n_sum
+    grad = g - gas_fraction
+    grad[gas] += np.log(n[gas] / n_sum) + np.log(P) + 1
+    return grad
+
+
+def assert_kkt(n, feed, g, A, P, gas):
+    """
+    Element balance, stationarity on the components present and no negative affinity on the absent ones.
+    """
+    np.testing.assert_allclose(n @ A, feed @ A, rtol=1e-9, atol=1e-9)
+    grad = baseline_gradient(n, g, P, gas)
+    present = n > 1e-9 * n.sum()
+    elements = np.any(A != 0, axis=0)
+    pi = np.linalg.lstsq(A[present][:, elements], grad[present], rcond=None)[0]
+    affinity = grad - A[:, elements] @ pi
+    np.testing.assert_allclose(affinity[present], 0, atol=1e-7)
+    assert np.all(affinity[~present] > -1e-7)
+
+
+@pytest.mark.parametrize('T, P, feed', [
+    (900, 1, [3, 1, 0, 0, 0, 0]),      # methane-rich: solid carbon forms
+    (1100, 5, [1, 0.5, 0, 0.2, 0, 0]),
+    (900, 1, [1, 4, 0, 0, 0, 0]),      # steam-rich: no solid
+])
+def test_rand_satisfies_baseline_kkt(document, T, P, feed):
+    A = formula_matrix(document)
+    gas = np.array([component['Phase'] != 's' for component in document.data.values()])
+    phases = [component['Phase'] for component in document.data.values()]
+    feed = np.array(feed, dtype=float) + 1e-5
+    g = gibbs_pad(T, document.data) / (R * T)
+
+    n, converged, _ = rand_equilibrium(g, A, feed, P, phases)
+
+    assert converged[0]
+    assert_kkt(n[0], feed, g, A, P, gas)
+
+
+def test_rand_solid_case_matches_baseline_optimum(document):
+    A = formula_matrix(document)
+    phases = [component['Phase'] for component in document.data.values()]
+    feed = np.array([3, 1, 0, 0, 0, 0], dtype=float) + 1e-5
+    g = gibbs_pad(900, document.data) / (R * 900)
+
+    n, converged, _ = rand_equilibrium(g, A, feed, 1, phases)
+
+    assert converged[0]
+    assert n[0, 0] == pytest.approx(0.573, abs=1e-3)
+    assert n[0, 5] == pytest.approx(2.189, abs=1e-3)
+
+
+def test_rand_matches_ipopt_with_solid(document):
+    from app.gibbs import Gibbs
+    from app.auxiliar_func.get_solver import get_ipopt_solver
+    if not get_ipopt_solver().available(exception_flag=False):
+        pytest.skip("IPOPT not available")
+
+    feed = np.array([3, 1, 0, 0, 0, 0], dtype=float)
+    rand = Gibbs(document.data, document.species, document.components, '---', document.kij, engine='rand')
+    ipopt = Gibbs(document.data, document.species, document.components, '---', document.kij, engine='ipopt')
+
+    np.testing.assert_allclose(rand.solve_gibbs(feed.copy(), 900, 1), ipopt.solve_gibbs(feed.copy(), 900, 1), atol=1e-4)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from app.auxiliar_func.read_data import ReadData
+from app.auxiliar_func.eos import fug, fug_batch
+
+EQUATIONS = ['Peng-Robinson', 'Soave-Redlich-Kwong', 'Redlich-Kwong', 'Virial']
+
+
+@pytest.fixture(scope='module')
+def document():
+    return ReadData('thermodynamic_data.xlsx', use_cache=False)
+
+
+def random_states(document, count=300, seed=0):
+    rng = np.random.default_rng(seed)
+    T = rng.uniform(300, 1500, count)
+    P = rng.uniform(1, 300, count)
+    Y = rng.uniform(0, 2, (count, len(document.components)))
+    return T, P, Y
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_fug_batch_matches_fug(document, equation):
+    T, P, Y = random_states(document)
+    batch = fug_batch(T, P, Y, equation, document.data, document.kij)
+    single = np.array([fug(T[k], P[k], equation, Y[k], document.data, document.kij) for k in range(len(T))])
+
+    np.testing.assert_allclose(batch, single, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_solids_do_not_change_gas_fractions(document, equation):
+    T, P, Y = random_states(document, count=50, seed=1)
+    solid = [component['Phase'] == 's' for component in document.data.values()]
+    more_solid = Y.copy()
+    more_solid[:, solid] += 5.0
+
+    np.testing.assert_allclose(fug_batch(T, P, more_solid, equation, document.data, document.kij),
+                               fug_batch(T, P, Y, equation, document.data, document.kij), rtol=1e-12, equal_nan=True)
@@ -0,0 +1,77 @@
+import numpy as np
+import pyomo.environ as pyo
+import pytest
+from app.auxiliar_func.read_data import ReadData
+from app.auxiliar_func.eos import fug_batch
+from app.gibbs import Gibbs
+
+COMPONENTS = ['Water', 'Hydrogen']
+FEED = np.array([1.0, 1e-5])
+
+
+@pytest.fixture(scope='module')
+def water():
+    document = ReadData('thermodynamic_data.xlsx', use_cache=False)
+    data = {name: document.data[name] for name in COMPONENTS}
+    return data, document.kij.loc[COMPONENTS, COMPONENTS]
+
+
+def water_gibbs(water):
+    data, kij = water
+    return Gibbs(data, ['H', 'O'], np.array(COMPONENTS), '---', kij, 'Peng-Robinson')
+
+
+@pytest.mark.parametrize('T, P, three_roots', [
+    (400, 200, False),   # compressed liquid: a single, liquid-like root
+    (400, 1, True),      # vapour below the saturation pressure
+])
+def test_curvature_constraint_only_with_three_roots(water, T, P, three_roots):
+    gibbs = water_gibbs(water)
+    model = gibbs.update_model(FEED.copy(), T, P)
+    assert model.eos_root_curvature.active == three_roots
+
+
+def test_compressed_liquid_solves(water):
+    from app.auxiliar_func.get_solver import get_ipopt_solver
+    if not get_ipopt_solver().available(exception_flag=False):
+        pytest.skip("IPOPT not available")
+
+    data, kij = water
+    gibbs = water_gibbs(water)
+    n = gibbs.solve_gibbs(FEED.copy(), 400, 200)
+
+    phi = fug_batch(400, 200, np.array(n), 'Peng-Robinson', data, kij)[0]
+    np.testing.assert_allclose([pyo.value(gibbs.model.lnphi[i]) for i in gibbs.model.gases], np.log(phi), atol=1e-5)
+
+
+@pytest.mark.parametrize('resolved', [True, False])
+def test_root_selection_rechecked_at_solution(water, resolved):
+    gibbs = water_gibbs(water)
+    model = gibbs.update_model(FEED.copy(), 400, 1)
+    assert model.eos_root_curvature.active
+
+    # A solution whose composition gives the cubic a single real root.
+    solution = [0.5, 0.5]
+    for i, value in enumerate(solution):
+        model.n[i].set_value(value)
+    gibbs.run_solver = lambda model, warm_start: resolved
+    gibbs.check_root_selection(model, 400, 1)
+
+    assert model.eos_root_curvature.active == (not resolved)
+    assert [model.n[i].value for i in range(2)] == solution
+
+
+def test_cyipopt_warm_start_reuses_the_primal_point_only(water):
+    from app.auxiliar_func.get_solver import InProcessIpopt
+
+    class Solver(InProcessIpopt):
+        def __init__(self):
+            self.options = {}
+
+    gibbs = water_gibbs(water)
+    model = gibbs.update_model(FEED.copy(), 400, 1)
+    solver = Solver()
+    gibbs.warm_start_options(solver, model, True)
+
+    assert 'warm_start_init_point' not in solver.options
+    assert 'mu_init' not in solver.options
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from app.auxiliar_func.read_data import ReadData
+from app.gibbs import Gibbs
+from app.entropy import Entropy
+
+INHIBITED = 'Carbon'
+
+
+@pytest.fixture(scope='module')
+def document():
+    return ReadData('thermodynamic_data.xlsx', use_cache=False)
+
+
+def feed(document):
+    # Methane-rich feed: without inhibition solid carbon forms.
+    initial = document.initial.astype(float).copy()
+    initial[list(document.components).index('Methane')] = 3.0
+    return initial
+
+
+def solvers(document, engine='ipopt'):
+    gibbs = Gibbs(document.data, document.species, document.components, INHIBITED, document.kij, engine=engine)
+    entropy = Entropy(document.data, document.species, document.components, INHIBITED)
+    return gibbs, entropy
+
+
+def test_bounds_inhibit_the_component(document):
+    index = list(document.components).index(INHIBITED)
+    for solver in solvers(document):
+        assert solver.bnds_values(feed(document))[index][1] <= 1e-5
+
+
+def test_rand_engine_inhibits_the_component(document):
+    gibbs, _ = solvers(document, engine='rand')
+    n = gibbs.solve_gibbs(feed(document), 900, 1)
+    assert n[list(document.components).index(INHIBITED)] <= 1e-5
+
+
+def test_solved_points_inhibit_the_component(document):
+    from app.auxiliar_func.get_solver import get_ipopt_solver
+    if not get_ipopt_solver().available(exception_flag=False):
+        pytest.skip("IPOPT not available")
+
+    index = list(document.components).index(INHIBITED)
+    gibbs, entropy = solvers(document)
+    assert gibbs.solve_gibbs(feed(document), 900, 1)[index] <= 1e-5 + 1e-8
+    n, _ = entropy.solve_entropy(feed(document), 900, 1)
+    assert n[index] <= 1e-5 + 1e-8
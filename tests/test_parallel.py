@@ -0,0 +1,32 @@
+import time
+import pytest
+from app.auxiliar_func.parallel import solve_points
+
+
+class SlowRunner:
+    """
+    Runner whose first point fails and every other point takes 0.2 s.
+    """
+    def create_instance(self):
+        return None
+
+    def solve_point(self, instance, value):
+        if value == 0:
+            raise ValueError("point failed")
+        time.sleep(0.2)
+        return value
+
+
+def test_failed_point_cancels_queued_chunks():
+    tasks = [(idx, (idx,)) for idx in range(200)]
+    start = time.monotonic()
+    with pytest.raises(ValueError):
+        solve_points(SlowRunner(), tasks, workers=2, chunk_size=1)
+    # Running every queued point would take about 20 s.
+    assert time.monotonic() - start < 10
+
+
+def test_results_in_task_order():
+    tasks = [(idx, (idx + 1,)) for idx in range(6)]
+    results, _ = solve_points(SlowRunner(), tasks, workers=2, chunk_size=2)
+    assert results == [(idx, idx + 1) for idx in range(6)]
@@ -0,0 +1,34 @@
+import os
+import shutil
+import pytest
+from app.auxiliar_func.read_data import ReadData
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.setenv('TES_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'data' / 'thermodynamic_data.xlsx'
+    path.parent.mkdir()
+    shutil.copy('thermodynamic_data.xlsx', path)
+    return str(path)
+
+
+def test_cached_load_equals_workbook(workbook, tmp_path):
+    fresh = ReadData(workbook, use_cache=False)
+    ReadData(workbook)
+    cached = ReadData(workbook)
+
+    assert cached.dataframe.equals(fresh.dataframe)
+    assert cached.kij.equals(fresh.kij)
+    assert cached.data == fresh.data
+    # The cache lives in the per-user directory, not next to the workbook.
+    assert os.listdir(tmp_path / 'data') == ['thermodynamic_data.xlsx']
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+
+def test_tampered_cache_is_ignored(workbook):
+    document = ReadData(workbook)
+    with open(document.cache_path(), 'wb') as file:
+        file.write(b'\x80\x05not json')
+
+    assert ReadData(workbook).data == document.data
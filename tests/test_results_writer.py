@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import pytest
+from app.auxiliar_func.results_writer import ResultsWriter, read_results, iter_results, recover_results, result_columns
+
+pytest.importorskip('pyarrow')
+
+COLUMNS = ['Methane', 'Temperature', 'Pressure']
+ROWS = np.arange(15, dtype=float).reshape(5, 3)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow', '.csv'])
+def test_closed_file_holds_every_row(tmp_path, extension):
+    path = str(tmp_path / f'results{extension}')
+    with ResultsWriter(path, COLUMNS, chunk_size=2) as writer:
+        for row in ROWS:
+            writer.write(row)
+
+    assert os.listdir(tmp_path) == [f'results{extension}']
+    np.testing.assert_array_equal(read_results(path).to_numpy(), ROWS)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow', '.csv'])
+def test_flushed_rows_survive_a_crash(tmp_path, extension):
+    path = str(tmp_path / f'results{extension}')
+    writer = ResultsWriter(path, COLUMNS, chunk_size=2)
+    for row in ROWS:
+        writer.write(row)
+    # The sweep is killed here: close() never runs and the last row is still in memory.
+
+    assert result_columns(path) == COLUMNS
+    np.testing.assert_array_equal(read_results(path).to_numpy(), ROWS[:4])
+    np.testing.assert_array_equal(np.vstack([batch.to_numpy() for batch in iter_results(path)]), ROWS[:4])
+    if extension != '.csv':
+        assert recover_results(path) == 4
+        assert os.listdir(tmp_path) == [f'results{extension}']
+        np.testing.assert_array_equal(read_results(path, ['Pressure']).to_numpy()[:, 0], ROWS[:4, 2])